@@ -0,0 +1,85 @@
+"""유통기한 알림 스캔(check_expiring_ingredients) 벤치마크
+
+합성 재료 N개를 넣고 첫 실행(알림 생성)과 재실행(중복 방지로 생성 없음) 시간을 잽니다.
+created는 만들어진 알림 행 수입니다 (EXPIRY_NOTIFICATION_MODE=item이면 재료 수, digest면 사용자 수).
+기본은 임시 SQLite 파일이며, MariaDB로 재려면 DATABASE_URL/ASYNC_DATABASE_URL을 지정합니다.
+
+    python bench_expiry_scan.py --ingredients 1000000 --users 10000
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import random
+import tempfile
+import time
+
+if not os.getenv("ASYNC_DATABASE_URL"):
+    _path = os.path.join(tempfile.mkdtemp(), "bench_expiry.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_path}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_path}"
+
+from sqlalchemy import delete, insert  # noqa: E402
+
+from database import AsyncSessionLocal, Base, async_engine, engine  # noqa: E402
+from expiry import check_expiring_ingredients  # noqa: E402
+from models import ExpiryNotice, Ingredient, Notification, User  # noqa: E402
+
+NAMES = ["감자", "양파", "당근", "우유", "계란", "두부", "김치", "대파", "버섯", "사과"]
+
+
+def populate(total: int, users: int, expiring_ratio: float, chunk: int = 50_000):
+    Base.metadata.create_all(bind=engine)
+    now = datetime.datetime.now()
+    with engine.begin() as conn:
+        conn.execute(delete(Notification))
+        conn.execute(delete(ExpiryNotice))
+        conn.execute(delete(Ingredient))
+        conn.execute(delete(User))
+        conn.execute(
+            insert(User),
+            [{"kakao_id": uid, "nickname": f"u{uid}", "profile_image": ""} for uid in range(1, users + 1)],
+        )
+        rng = random.Random(42)
+        for offset in range(0, total, chunk):
+            rows = []
+            for _ in range(min(chunk, total - offset)):
+                if rng.random() < expiring_ratio:
+                    limit_date = now + datetime.timedelta(hours=rng.uniform(1, 71))
+                else:
+                    limit_date = now + datetime.timedelta(days=rng.uniform(4, 30))
+                rows.append(
+                    {
+                        "name": rng.choice(NAMES),
+                        "category": "기타",
+                        "added_date": limit_date - datetime.timedelta(days=15),
+                        "limit_date": limit_date,
+                        "kakao_id": rng.randint(1, users),
+                    }
+                )
+            conn.execute(insert(Ingredient), rows)
+
+
+async def timed_run(label: str):
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        created = await check_expiring_ingredients(db)
+        elapsed = time.perf_counter() - start
+    print(f"{label:<8} created={len(created)} elapsed={elapsed * 1000:.1f}ms")
+
+
+async def main(args):
+    start = time.perf_counter()
+    populate(args.ingredients, args.users, args.expiring_ratio)
+    print(f"populate ingredients={args.ingredients} elapsed={time.perf_counter() - start:.1f}s")
+    await timed_run("first")
+    await timed_run("repeat")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ingredients", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--expiring-ratio", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,96 @@
+"""외부 API 호출 시 새 클라이언트 방식과 공유 클라이언트 방식의 커넥션(핸드셰이크) 수 비교
+
+로컬 keep-alive HTTP 서버에 요청을 보내고, 서버가 받은 TCP 연결 수를 셉니다.
+
+    python bench_http_clients.py --requests 200 --concurrency 10
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from http_clients import HTTPClientRegistry
+
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 2\r\n"
+    b"Connection: keep-alive\r\n\r\n{}"
+)
+
+
+class CountingServer:
+    """연결 수를 세는 최소한의 HTTP/1.1 keep-alive 서버"""
+
+    def __init__(self):
+        self.connections = 0
+        self.server = None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                writer.write(RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def per_call(url: str):
+    # 기존 방식: 호출마다 클라이언트를 새로 생성
+    async with httpx.AsyncClient() as ac:
+        (await ac.get(url)).raise_for_status()
+
+
+async def run(label: str, call, total: int, concurrency: int):
+    server = CountingServer()
+    url = await server.start()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            await call(url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    await server.stop()
+    print(
+        f"{label:<8} requests={total} connections={server.connections} "
+        f"elapsed={elapsed * 1000:.1f}ms"
+    )
+
+
+async def main(total: int, concurrency: int):
+    await run("per-call", per_call, total, concurrency)
+
+    registry = HTTPClientRegistry({"bench": {"http2": False}})
+
+    async def shared(url: str):
+        (await registry.get("bench").get(url)).raise_for_status()
+
+    await run("shared", shared, total, concurrency)
+    await registry.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,105 @@
+"""웹 푸시 전송 파이프라인(PushDispatcher) 처리량 벤치마크
+
+실제 푸시 서비스 대신 지연과 실패를 흉내 내는 로컬 가짜 엔드포인트로 전송합니다.
+
+    python bench_push.py --messages 5000 --users 1000 --latency 0.02 --workers 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+if not os.getenv("ASYNC_DATABASE_URL"):
+    _path = os.path.join(tempfile.mkdtemp(), "bench_push.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_path}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_path}"
+
+from sqlalchemy import delete, insert  # noqa: E402
+
+from database import Base, async_engine, engine  # noqa: E402
+from models import User  # noqa: E402
+from push import PushDispatcher, PushGoneError  # noqa: E402
+
+
+class FakePushEndpoint:
+    """푸시 서비스 흉내: 호출마다 latency만큼 블로킹하고, 일부는 410/일시 오류를 돌려줍니다."""
+
+    def __init__(self, latency: float, gone: set, flaky_ratio: float):
+        self.latency = latency
+        self.gone = gone
+        self.flaky_ratio = flaky_ratio
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(7)
+
+    def __call__(self, subscription_info: dict, data: str):
+        with self._lock:
+            self.calls += 1
+            flaky = self._rng.random() < self.flaky_ratio
+        time.sleep(self.latency)
+        if subscription_info["endpoint"] in self.gone:
+            raise PushGoneError("410 Gone")
+        if flaky:
+            raise RuntimeError("503 Service Unavailable")
+
+
+def subscription(uid: int) -> str:
+    return json.dumps(
+        {"endpoint": f"https://push.invalid/{uid}", "keys": {"p256dh": "k", "auth": "a"}}
+    )
+
+
+def populate(users: int):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(delete(User))
+        conn.execute(
+            insert(User),
+            [
+                {"kakao_id": uid, "nickname": "", "profile_image": "", "push_subscription": subscription(uid)}
+                for uid in range(1, users + 1)
+            ],
+        )
+
+
+async def main(args):
+    populate(args.users)
+    gone = {f"https://push.invalid/{uid}" for uid in range(1, args.users + 1) if uid % 50 == 0}
+    endpoint = FakePushEndpoint(args.latency, gone, args.flaky_ratio)
+    dispatcher = PushDispatcher(
+        sender=endpoint,
+        workers=args.workers,
+        queue_size=args.messages,
+        retry_backoff=0.01,
+    )
+    dispatcher.start()
+
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for i in range(args.messages):
+        uid = rng.randint(1, args.users)
+        dispatcher.enqueue(uid, subscription(uid), {"title": "유통기한 임박 알림", "body": f"재료 {i}"})
+    await dispatcher.queue.join()
+    elapsed = time.perf_counter() - start
+    await dispatcher.stop()
+    await async_engine.dispose()
+
+    print(
+        f"messages={args.messages} workers={args.workers} calls={endpoint.calls} "
+        f"elapsed={elapsed:.2f}s throughput={args.messages / elapsed:.0f} msg/s"
+    )
+    print(dispatcher.state())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--flaky-ratio", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
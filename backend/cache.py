@@ -0,0 +1,65 @@
+import threading
+
+from cachetools import TTLCache
+
+_MISSING = object()
+
+# 이름별로 등록된 캐시 (/debug/caches에서 통계 조회)
+caches = {}
+
+
+class TTLLRUCache:
+    """TTL이 지나거나 용량을 넘으면 가장 오래 쓰지 않은 항목부터 버리는 캐시입니다."""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        caches[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def __contains__(self, key):
+        # hit/miss 통계에 넣지 않는 존재 확인
+        with self._lock:
+            return key in self._data
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+def cache_stats() -> dict:
+    """등록된 모든 캐시의 통계를 반환합니다."""
+    return {name: c.stats() for name, c in caches.items()}
@@ -1,10 +1,19 @@
 import os
+import threading
+import time
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from query_log import query_logger
+
 load_dotenv()
 
 DB_USERNAME = os.getenv("DB_USERNAME")
@@ -13,26 +22,195 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_DATABASE = os.getenv("DB_DATABASE")
 
-DATABASE_URL = f"mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_DATABASE}"
+# 테스트에서는 DATABASE_URL=sqlite:///./test.db, ASYNC_DATABASE_URL=sqlite+aiosqlite:///./test.db 로 대체
+DATABASE_URL = os.getenv("DATABASE_URL") or (
+    f"mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_DATABASE}"
+)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    f"mysql+aiomysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_DATABASE}"
+)
+
+# 커넥션 풀 설정 (배포 환경별로 워커 수와 DB max-connections에 맞춰 조정)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+
+class PoolStats:
+    """커넥션 풀 대기 시간과 타임아웃 횟수를 누적합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / attempts, 3) if attempts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+def _timed_pool(base):
+    """풀에서 커넥션을 꺼낼 때까지 기다린 시간을 기록하는 풀 클래스를 만듭니다."""
+
+    class TimedPool(base):
+        stats = None
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except PoolTimeoutError:
+                self.stats.record(time.perf_counter() - start, timed_out=True)
+                raise
+            self.stats.record(time.perf_counter() - start)
+            return conn
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
+sync_pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+
+def _pool_kwargs(url: str, base, stats: PoolStats) -> dict:
+    """엔진 생성 인자를 만듭니다. SQLite는 풀 크기 설정을 받지 않으므로 기본값을 사용합니다."""
+    kwargs = {"pool_recycle": DB_POOL_RECYCLE, "pool_pre_ping": DB_POOL_PRE_PING}
+    if url.startswith("sqlite"):
+        return kwargs
+    poolclass = _timed_pool(base)
+    poolclass.stats = stats
+    kwargs.update(
+        poolclass=poolclass,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    return kwargs
+
 
-# 엔진 생성 (pool_recycle=3600: 1시간마다 연결 재생성)
+# 엔진 생성 (pool_recycle: 기본 1시간마다 연결 재생성)
+# 동기 엔진은 테이블 생성, 이미지 초기화 등 시작 스크립트 전용
 engine = create_engine(
     DATABASE_URL,
-    pool_recycle=3600,
-    pool_pre_ping=True,  # 연결 상태 확인
-    echo=True  # SQL 쿼리 로깅
+    **_pool_kwargs(DATABASE_URL, QueuePool, sync_pool_stats),
 )
 
+# 요청 처리용 비동기 엔진 (이벤트 루프를 막지 않음)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_pool_kwargs(ASYNC_DATABASE_URL, AsyncAdaptedQueuePool, async_pool_stats),
+)
+
+# echo=True 대신 느린 쿼리 + 샘플링 로깅 (SLOW_QUERY_MS, QUERY_LOG_SAMPLE_RATE)
+query_logger.attach(engine)
+query_logger.attach(async_engine.sync_engine)
+
 # 세션 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 커밋 후에도 속성을 다시 읽지 않도록 expire_on_commit=False (비동기 세션은 lazy load 불가)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 # Base 클래스 생성
 Base = declarative_base()
 
 
+def insert_ignore(model, dialect_name: str):
+    """유니크 키가 겹치는 행은 건너뛰는 INSERT 문을 만듭니다."""
+    if dialect_name in ("mysql", "mariadb"):
+        return insert(model).prefix_with("IGNORE")
+    if dialect_name == "sqlite":
+        return insert(model).prefix_with("OR IGNORE")
+    raise ValueError(f"지원하지 않는 DB입니다: {dialect_name}")
+
+
+async def insert_returning_ids(db, model, rows: list) -> list:
+    """행들을 한 번의 INSERT로 넣고 생성된 id 목록을 입력 순서대로 반환합니다."""
+    if db.bind.dialect.insert_returning:
+        # SQLite, MariaDB 방언 등: RETURNING으로 id를 바로 받음
+        result = await db.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True), rows
+        )
+        return list(result.scalars().all())
+
+    # MySQL: 다중 행 INSERT의 LAST_INSERT_ID()는 첫 행의 id이고,
+    # innodb_autoinc_lock_mode <= 1(MariaDB 기본값)에서는 한 문장 안의 id가 연속으로 할당됨
+    result = await db.execute(insert(model).values(rows))
+    first_id = result.lastrowid
+    return list(range(first_id, first_id + len(rows)))
+
+
+def upsert(model, dialect_name: str, values: dict, update_columns: list):
+    """기본 키가 겹치면 update_columns만 새 값으로 바꾸는 INSERT 문을 만듭니다."""
+    if dialect_name in ("mysql", "mariadb"):
+        stmt = mysql_insert(model).values(values)
+        return stmt.on_duplicate_key_update(
+            {column: stmt.inserted[column] for column in update_columns}
+        )
+    if dialect_name == "sqlite":
+        stmt = sqlite_insert(model).values(values)
+        return stmt.on_conflict_do_update(
+            index_elements=[c.name for c in model.__table__.primary_key.columns],
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+    raise ValueError(f"지원하지 않는 DB입니다: {dialect_name}")
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _describe_pool(pool, stats: PoolStats) -> dict:
+    info = {"class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        info.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # overflow()는 pool_size를 넘겨 연 커넥션 수 (음수면 아직 여유 슬롯)
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+        info.update(stats.snapshot())
+    return info
+
+
+def pool_status() -> dict:
+    """동기/비동기 엔진의 커넥션 풀 상태를 반환합니다."""
+    return {
+        "sync": _describe_pool(engine.pool, sync_pool_stats),
+        "async": _describe_pool(async_engine.sync_engine.pool, async_pool_stats),
+    }
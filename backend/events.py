@@ -0,0 +1,269 @@
+import abc
+import asyncio
+import json
+import logging
+import os
+
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models import Notification as NotificationModel
+
+logger = logging.getLogger(__name__)
+
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+SSE_HEARTBEAT = float(os.getenv("SSE_HEARTBEAT", "15"))
+NOTIFICATION_BROKER = os.getenv("NOTIFICATION_BROKER", "memory")
+DB_TAIL_INTERVAL = float(os.getenv("NOTIFICATION_DB_TAIL_INTERVAL", "2"))
+# 늦게 커밋된 작은 id도 받도록 마지막 id 아래로 다시 읽는 범위 (id 개수)
+DB_TAIL_OVERLAP = int(os.getenv("NOTIFICATION_DB_TAIL_OVERLAP", "200"))
+
+
+def user_channel(kakao_id: int) -> str:
+    return f"user:{kakao_id}"
+
+
+class Subscription:
+    """구독자 한 명의 bounded 큐. 가득 차면 가장 오래된 이벤트를 버리고 lagged로 표시합니다."""
+
+    def __init__(self, channel: str, maxsize: int = SSE_QUEUE_SIZE):
+        self.channel = channel
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.lagged = False
+        self.dropped = 0
+
+    def push(self, event: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.lagged = True
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float):
+        """이벤트를 기다립니다. timeout 안에 없으면 None."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker(abc.ABC):
+    """알림 이벤트 pub/sub 인터페이스. 워커 간 전달 방식에 따라 구현을 바꿔 끼웁니다."""
+
+    @abc.abstractmethod
+    async def publish(self, channel: str, event: dict):
+        ...
+
+    @abc.abstractmethod
+    def subscribe(self, channel: str) -> Subscription:
+        ...
+
+    @abc.abstractmethod
+    def unsubscribe(self, subscription: Subscription):
+        ...
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def state(self) -> dict:
+        return {}
+
+
+class InProcessBroker(Broker):
+    """같은 프로세스 안의 구독자에게만 전달하는 브로커 (워커 1개, 테스트용)"""
+
+    def __init__(self):
+        self._channels = {}
+        self.published = 0
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(channel)
+        self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._channels.get(subscription.channel)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[subscription.channel]
+
+    def deliver(self, channel: str, event: dict):
+        for subscription in self._channels.get(channel, ()):
+            subscription.push(event)
+        self.published += 1
+
+    async def publish(self, channel: str, event: dict):
+        self.deliver(channel, event)
+
+    def state(self) -> dict:
+        return {
+            "broker": type(self).__name__,
+            "channels": len(self._channels),
+            "subscribers": sum(len(s) for s in self._channels.values()),
+            "published": self.published,
+        }
+
+
+class DatabaseTailBroker(InProcessBroker):
+    """워커마다 notifications 테이블의 새 행을 id 순으로 읽어 자기 구독자에게 전달합니다.
+
+    클라이언트별 폴링 대신 워커당 한 쿼리로 여러 워커에 흩어진 구독자가 모두 이벤트를 받습니다.
+    알림은 DB에 쓰인 뒤 tail로 전달되므로 publish는 아무 일도 하지 않습니다.
+
+    id는 커밋 순서와 다를 수 있으므로(여러 워커의 동시 INSERT) 매번 마지막 id 아래 overlap개
+    범위를 다시 읽고, 이미 전달한 id는 건너뜁니다.
+    """
+
+    def __init__(
+        self,
+        interval: float = DB_TAIL_INTERVAL,
+        session_factory=AsyncSessionLocal,
+        overlap: int = DB_TAIL_OVERLAP,
+    ):
+        super().__init__()
+        self.interval = interval
+        self.session_factory = session_factory
+        self.overlap = overlap
+        self.last_id = None
+        # 이 id 이하는 다시 읽지 않음 (시작 시점이나 구독자가 없던 동안의 위치)
+        self._floor = 0
+        # 다시 읽는 범위 안에서 이미 전달한 id
+        self._delivered = set()
+        self._task = None
+
+    async def publish(self, channel: str, event: dict):
+        return
+
+    async def _poll(self):
+        async with self.session_factory() as db:
+            if self.last_id is None or not self._channels:
+                # 처음이거나 구독자가 없으면 위치만 따라감
+                latest = await db.scalar(select(NotificationModel.id).order_by(NotificationModel.id.desc()).limit(1))
+                self.last_id = latest or self.last_id or 0
+                self._floor = self.last_id
+                self._delivered.clear()
+                return
+            rows = (
+                await db.scalars(
+                    select(NotificationModel)
+                    .where(NotificationModel.id > max(self.last_id - self.overlap, self._floor))
+                    .order_by(NotificationModel.id)
+                    .limit(1000)
+                )
+            ).all()
+        for notification in rows:
+            if notification.id in self._delivered or notification.id <= self._floor:
+                continue
+            self.deliver(user_channel(notification.kakao_id), notification_event(notification))
+            self._delivered.add(notification.id)
+            self.last_id = max(self.last_id, notification.id)
+        low = self.last_id - self.overlap
+        self._delivered = {i for i in self._delivered if i > low}
+
+    async def _run(self):
+        while True:
+            try:
+                await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"알림 tail 조회 중 오류 발생: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def state(self) -> dict:
+        return {**super().state(), "last_id": self.last_id}
+
+
+def create_broker(kind: str = NOTIFICATION_BROKER) -> Broker:
+    if kind == "memory":
+        return InProcessBroker()
+    if kind == "db":
+        return DatabaseTailBroker()
+    raise ValueError(f"지원하지 않는 알림 브로커입니다: {kind}")
+
+
+def notification_event(notification) -> dict:
+    return {"id": notification.id, "event": "notification", "data": notification.to_dict()}
+
+
+def format_sse(event: dict) -> str:
+    lines = []
+    if event.get("id") is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['event']}")
+    lines.append(f"data: {json.dumps(event['data'], ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def publish_created_notifications(db, rows: list):
+    """새로 만든 알림을 id로 다시 읽어 사용자 채널로 발행합니다 (expiry 리스너)."""
+    if not rows or isinstance(notification_broker, DatabaseTailBroker):
+        return
+    notifications = (
+        await db.scalars(
+            select(NotificationModel)
+            .where(NotificationModel.id.in_([row["id"] for row in rows]))
+            .order_by(NotificationModel.id)
+        )
+    ).all()
+    for notification in notifications:
+        await notification_broker.publish(
+            user_channel(notification.kakao_id), notification_event(notification)
+        )
+
+
+async def stream_notifications(request, kakao_id: int, last_event_id: int = None):
+    """사용자의 새 알림을 SSE로 흘려보냅니다. 연결 직후 Last-Event-ID 이후 알림을 먼저 보냅니다."""
+    subscription = notification_broker.subscribe(user_channel(kakao_id))
+    try:
+        yield "retry: 5000\n\n"
+        if last_event_id is not None:
+            async with AsyncSessionLocal() as db:
+                missed = (
+                    await db.scalars(
+                        select(NotificationModel)
+                        .where(
+                            NotificationModel.kakao_id == kakao_id,
+                            NotificationModel.id > last_event_id,
+                        )
+                        .order_by(NotificationModel.id)
+                        .limit(SSE_QUEUE_SIZE)
+                    )
+                ).all()
+            for notification in missed:
+                yield format_sse(notification_event(notification))
+
+        while True:
+            event = await subscription.get(timeout=SSE_HEARTBEAT)
+            if await request.is_disconnected():
+                break
+            if subscription.lagged:
+                # 느린 클라이언트: 일부 이벤트를 버렸으니 목록을 다시 불러오도록 알림
+                subscription.lagged = False
+                yield format_sse({"event": "resync", "data": {"dropped": subscription.dropped}})
+            if event is None:
+                yield ": ping\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        notification_broker.unsubscribe(subscription)
+
+
+notification_broker = create_broker()
@@ -0,0 +1,307 @@
+import asyncio
+import datetime
+import heapq
+import itertools
+import logging
+import os
+import uuid
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import AsyncSessionLocal, insert_ignore, insert_returning_ids
+from notifications import add_unread_for_rows
+from models import ExpiryNotice, Ingredient, Notification as NotificationModel
+
+logger = logging.getLogger(__name__)
+
+EXPIRY_NOTICE_DAYS = 3
+EXPIRY_NOTIFICATION_TITLE = "유통기한 임박 알림"
+# digest: 사용자별로 한 건에 묶어서, item: 재료마다 한 건씩
+EXPIRY_NOTIFICATION_MODE = os.getenv("EXPIRY_NOTIFICATION_MODE", "digest")
+# 타임라인에 미리 올려둘 알림 시각 범위 (주기 스캔 간격보다 길어야 함)
+EXPIRY_TIMELINE_HORIZON = int(os.getenv("EXPIRY_TIMELINE_HORIZON", str(8 * 60 * 60)))
+EXPIRY_TIMELINE_MAX_SLEEP = 60 * 60
+
+# 새 알림이 만들어졌을 때 호출되는 async 함수들 (db, rows) - 예: 푸시 전송 큐
+notification_listeners = []
+
+
+async def notify_listeners(db: AsyncSession, rows: list):
+    for listener in notification_listeners:
+        try:
+            await listener(db, rows)
+        except Exception as e:
+            logger.error(f"알림 후속 처리 중 오류 발생: {str(e)}")
+
+
+def _item(ingredient_id, name, limit_date, now) -> dict:
+    return {
+        "ingredientId": ingredient_id,
+        "name": name,
+        "limitDate": limit_date.isoformat(),
+        "daysLeft": (limit_date - now).days,
+    }
+
+
+def _item_rows(expiring: list, now: datetime.datetime) -> list:
+    """재료마다 알림 한 건"""
+    return [
+        {
+            "kakao_id": kakao_id,
+            "title": EXPIRY_NOTIFICATION_TITLE,
+            "body": f"{name}의 유통기한이 {(limit_date - now).days}일 남았습니다.",
+            "payload": {"items": [_item(ingredient_id, name, limit_date, now)]},
+            "is_read": False,
+            "created_at": now,
+        }
+        for ingredient_id, kakao_id, name, limit_date in expiring
+    ]
+
+
+def _digest_rows(expiring: list, now: datetime.datetime) -> list:
+    """사용자마다 이번 실행에서 임박한 재료를 모은 알림 한 건"""
+    items_by_user = {}
+    for ingredient_id, kakao_id, name, limit_date in sorted(expiring, key=lambda r: r[3]):
+        items_by_user.setdefault(kakao_id, []).append(_item(ingredient_id, name, limit_date, now))
+
+    rows = []
+    for kakao_id, items in items_by_user.items():
+        names = ", ".join(item["name"] for item in items[:3])
+        more = f" 외 {len(items) - 3}개" if len(items) > 3 else ""
+        rows.append(
+            {
+                "kakao_id": kakao_id,
+                "title": EXPIRY_NOTIFICATION_TITLE,
+                "body": f"{names}{more}의 유통기한이 {EXPIRY_NOTICE_DAYS}일 이내로 남았습니다.",
+                "payload": {"items": items},
+                "is_read": False,
+                "created_at": now,
+            }
+        )
+    return rows
+
+
+async def check_expiring_ingredients(
+    db: AsyncSession, ingredient_ids: Optional[Iterable[int]] = None, mode: str = None
+) -> list:
+    """유통기한이 3일 이하로 남은 재료를 확인하고 알림을 생성합니다.
+
+    오늘 이미 알린 재료는 expiry_notices의 (kakao_id, ingredient_id, notify_date) 기준
+    anti-join으로 한 번에 걸러냅니다. 남은 재료는 실행 id를 붙여 expiry_notices에 먼저
+    넣고(INSERT IGNORE), 실제로 이 실행이 넣은 재료만 알림으로 만듭니다. 그래서 여러 워커가
+    동시에 같은 재료를 확인해도 알림은 한 번만 만들어집니다.
+
+    mode가 "digest"면 사용자마다 알림 한 건에 재료 목록(payload)을 담고,
+    "item"이면 재료마다 알림을 한 건씩 만듭니다. ingredient_ids를 주면 해당 재료만 확인합니다.
+    """
+    mode = mode or EXPIRY_NOTIFICATION_MODE
+    now = datetime.datetime.now()
+    today = now.date()
+    notice_until = now + datetime.timedelta(days=EXPIRY_NOTICE_DAYS)
+
+    already_notified = (
+        select(ExpiryNotice.ingredient_id)
+        .where(
+            ExpiryNotice.kakao_id == Ingredient.kakao_id,
+            ExpiryNotice.ingredient_id == Ingredient.id,
+            ExpiryNotice.notify_date == today,
+        )
+        .exists()
+    )
+    expiring = (
+        await db.execute(
+            select(
+                Ingredient.id, Ingredient.kakao_id, Ingredient.name, Ingredient.limit_date
+            ).where(
+                Ingredient.limit_date <= notice_until,
+                Ingredient.limit_date > now,
+                Ingredient.kakao_id.is_not(None),
+                ~already_notified,
+                *([Ingredient.id.in_(list(ingredient_ids))] if ingredient_ids is not None else []),
+            )
+        )
+    ).all()
+
+    if not expiring:
+        return []
+
+    run_id = uuid.uuid4().hex
+    await db.execute(
+        insert_ignore(ExpiryNotice, db.bind.dialect.name),
+        [
+            {"kakao_id": kakao_id, "ingredient_id": ingredient_id, "notify_date": today, "run_id": run_id}
+            for ingredient_id, kakao_id, _, _ in expiring
+        ],
+    )
+    claimed = set(
+        (
+            await db.scalars(
+                select(ExpiryNotice.ingredient_id).where(ExpiryNotice.run_id == run_id)
+            )
+        ).all()
+    )
+    expiring = [row for row in expiring if row[0] in claimed]
+    if not expiring:
+        await db.commit()
+        return []
+
+    rows = _digest_rows(expiring, now) if mode == "digest" else _item_rows(expiring, now)
+    # 발행/푸시 리스너가 알림을 id로 다시 찾을 수 있도록 생성된 id를 행에 붙임
+    ids = await insert_returning_ids(db, NotificationModel, rows)
+    for row, notification_id in zip(rows, ids):
+        row["id"] = notification_id
+    await add_unread_for_rows(db, rows)
+    await db.commit()
+    await notify_listeners(db, rows)
+    return rows
+
+
+def notice_time(limit_date: datetime.datetime) -> datetime.datetime:
+    """재료의 첫 유통기한 알림 시각 (유통기한 3일 전)"""
+    return limit_date - datetime.timedelta(days=EXPIRY_NOTICE_DAYS)
+
+
+def next_day_same_time(due: datetime.datetime, now: datetime.datetime) -> datetime.datetime:
+    """due와 같은 시각인 now 이후의 첫 날짜 (다음 날 알림 시각)
+
+    자정에 한꺼번에 다시 등록하면 모든 사용자의 알림/푸시가 자정에 몰리므로,
+    재료마다 원래 알림 시각(유통기한 3일 전 같은 시각)을 유지해 하루씩 미룹니다.
+    """
+    days = (now - due) // datetime.timedelta(days=1) + 1
+    return due + datetime.timedelta(days=max(days, 1))
+
+
+class ExpiryTimeline:
+    """재료별 다음 유통기한 알림 시각을 min-heap으로 관리하고, 시각이 된 재료만 확인합니다.
+
+    6시간마다 전체 테이블을 읽는 대신, 가까운 시간(horizon) 안에 알림이 필요한 재료를
+    한 번 적재한 뒤 재료 추가/수정/삭제 때마다 갱신합니다. 같은 재료를 여러 워커가 동시에
+    확인해도 알림 중복 방지 키 덕분에 알림은 하루 한 번만 만들어집니다.
+    """
+
+    def __init__(self, horizon: float = EXPIRY_TIMELINE_HORIZON, session_factory=AsyncSessionLocal):
+        self.horizon = datetime.timedelta(seconds=horizon)
+        self.session_factory = session_factory
+        self._heap = []
+        # ingredient_id -> 유효한 heap 항목의 순번 (수정/삭제된 항목은 꺼낼 때 버림)
+        self._entries = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.horizon_end = datetime.datetime.now() + self.horizon
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def schedule(self, ingredient_id: int, limit_date: datetime.datetime, due: datetime.datetime = None):
+        """재료의 다음 알림 시각을 등록(또는 교체)합니다."""
+        now = datetime.datetime.now()
+        due = due or notice_time(limit_date)
+        # 적재(load)는 리더 워커에서만 돌기 때문에 horizon_end 대신 현재 시각 기준으로 판단
+        if limit_date <= now or due > now + self.horizon:
+            # 이미 지났거나 범위 밖이면 다음 적재 때 다시 올라옴
+            self._entries.pop(ingredient_id, None)
+            return
+        seq = next(self._seq)
+        self._entries[ingredient_id] = seq
+        heapq.heappush(self._heap, (due, seq, ingredient_id, limit_date))
+        self._wakeup.set()
+
+    def remove(self, ingredient_id: int):
+        self._entries.pop(ingredient_id, None)
+
+    def next_due(self) -> Optional[datetime.datetime]:
+        while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime.datetime) -> dict:
+        """알림 시각이 된 재료를 꺼내 {ingredient_id: (limit_date, 알림 시각)}으로 반환합니다."""
+        due = {}
+        while self._heap and self._heap[0][0] <= now:
+            due_at, seq, ingredient_id, limit_date = heapq.heappop(self._heap)
+            if self._entries.get(ingredient_id) == seq:
+                del self._entries[ingredient_id]
+                due[ingredient_id] = (limit_date, due_at)
+        return due
+
+    async def load(self, db: AsyncSession):
+        """horizon 안에 알림 시각이 오는 재료를 한 번의 쿼리로 적재합니다."""
+        now = datetime.datetime.now()
+        self.horizon_end = now + self.horizon
+        rows = (
+            await db.execute(
+                select(Ingredient.id, Ingredient.limit_date).where(
+                    Ingredient.limit_date > now,
+                    Ingredient.limit_date
+                    <= self.horizon_end + datetime.timedelta(days=EXPIRY_NOTICE_DAYS),
+                )
+            )
+        ).all()
+        self._heap = []
+        self._entries = {}
+        for ingredient_id, limit_date in rows:
+            self.schedule(ingredient_id, limit_date)
+        logger.info(f"유통기한 알림 타임라인 적재: {len(self)}개")
+
+    async def fire_due(self):
+        """알림 시각이 된 재료만 확인하고, 유통기한 전이면 다음 날 알림을 다시 등록합니다."""
+        now = datetime.datetime.now()
+        due = self.pop_due(now)
+        if not due:
+            return []
+        async with self.session_factory() as db:
+            created = await check_expiring_ingredients(db, ingredient_ids=due.keys())
+        self.fired += len(due)
+
+        for ingredient_id, (limit_date, due_at) in due.items():
+            self.schedule(ingredient_id, limit_date, due=next_day_same_time(due_at, now))
+        return created
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.fire_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"유통기한 알림 처리 중 오류 발생: {str(e)}")
+
+            next_due = self.next_due()
+            timeout = EXPIRY_TIMELINE_MAX_SLEEP
+            if next_due is not None:
+                timeout = min(timeout, max((next_due - datetime.datetime.now()).total_seconds(), 0))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def state(self) -> dict:
+        next_due = self.next_due()
+        return {
+            "pending": len(self),
+            "next_due": next_due.isoformat() if next_due else None,
+            "horizon_end": self.horizon_end.isoformat(),
+            "fired": self.fired,
+        }
+
+
+expiry_timeline = ExpiryTimeline()
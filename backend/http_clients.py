@@ -0,0 +1,74 @@
+import logging
+import os
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+
+# 외부 호스트별 클라이언트 설정 (호스트마다 커넥션 풀을 따로 둡니다)
+CLIENT_CONFIGS = {
+    "kakao": {},
+    "youtube": {},
+    # GPT 응답은 수 초 이상 걸리므로 읽기 타임아웃을 길게
+    "openai": {"read_timeout": float(os.getenv("OPENAI_READ_TIMEOUT", "120"))},
+}
+
+
+class HTTPClientRegistry:
+    """keep-alive 커넥션 풀을 가진 httpx.AsyncClient를 이름별로 공유합니다."""
+
+    def __init__(self, configs: dict = None):
+        self.configs = configs if configs is not None else CLIENT_CONFIGS
+        self._clients = {}
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        config = self.configs.get(name, {})
+        limits = httpx.Limits(
+            max_connections=config.get("max_connections", HTTP_MAX_CONNECTIONS),
+            max_keepalive_connections=config.get("max_keepalive", HTTP_MAX_KEEPALIVE),
+            keepalive_expiry=config.get("keepalive_expiry", HTTP_KEEPALIVE_EXPIRY),
+        )
+        read_timeout = config.get("read_timeout", HTTP_READ_TIMEOUT)
+        timeout = httpx.Timeout(
+            connect=config.get("connect_timeout", HTTP_CONNECT_TIMEOUT),
+            read=read_timeout,
+            write=read_timeout,
+            pool=config.get("connect_timeout", HTTP_CONNECT_TIMEOUT),
+        )
+        return httpx.AsyncClient(
+            http2=config.get("http2", HTTP2_AVAILABLE),
+            limits=limits,
+            timeout=timeout,
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """이름에 해당하는 공유 클라이언트를 반환합니다. 없거나 닫혔으면 새로 만듭니다."""
+        ac = self._clients.get(name)
+        if ac is None or ac.is_closed:
+            ac = self._clients[name] = self._build(name)
+        return ac
+
+    async def aclose(self):
+        """앱 종료 시 모든 클라이언트의 커넥션을 닫습니다."""
+        clients, self._clients = self._clients, {}
+        for name, ac in clients.items():
+            try:
+                await ac.aclose()
+            except Exception as e:
+                logger.warning(f"HTTP 클라이언트 종료 실패 ({name}): {str(e)}")
+
+
+http_clients = HTTPClientRegistry()
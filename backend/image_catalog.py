@@ -0,0 +1,48 @@
+import threading
+from types import MappingProxyType
+
+from sqlalchemy import select
+
+
+class ImageCatalog:
+    """images 테이블을 메모리에 올려 이름으로 아이콘 URL을 찾는 읽기 전용 인덱스입니다.
+
+    카탈로그는 시작 시 한 번 적재하고, 바뀌었을 때만 reload로 통째로 교체합니다.
+    """
+
+    def __init__(self):
+        self._index = MappingProxyType({})
+        self._lock = threading.Lock()
+
+    def __contains__(self, name) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def url_for(self, name):
+        """이미지 이름에 해당하는 URL을 반환합니다. 없으면 None."""
+        if name is None:
+            return None
+        return self._index.get(name)
+
+    def replace(self, pairs):
+        """(name, image_url) 목록으로 인덱스를 새로 만들어 교체합니다."""
+        index = MappingProxyType(dict(pairs))
+        with self._lock:
+            self._index = index
+
+    def load(self, db):
+        """동기 세션으로 images 테이블을 읽어 적재합니다 (시작 스크립트용)."""
+        from models import Image
+
+        self.replace(db.execute(select(Image.name, Image.image_url)).all())
+
+    async def reload(self, db):
+        """비동기 세션으로 images 테이블을 다시 읽어 교체합니다."""
+        from models import Image
+
+        self.replace((await db.execute(select(Image.name, Image.image_url))).all())
+
+
+image_catalog = ImageCatalog()
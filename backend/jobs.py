@@ -0,0 +1,275 @@
+import abc
+import asyncio
+import datetime
+import logging
+import os
+import uuid
+from collections import Counter
+
+from sqlalchemy import update
+
+from database import AsyncSessionLocal
+from models import RecipeJob
+
+logger = logging.getLogger(__name__)
+
+RECIPE_JOB_WORKERS = int(os.getenv("RECIPE_JOB_WORKERS", "4"))
+# 사용자별 동시 작업 수 제한은 프로세스마다 따로 셈 (전체로는 워커 프로세스 수 × 이 값)
+RECIPE_JOB_PER_USER = int(os.getenv("RECIPE_JOB_PER_USER", "2"))
+RECIPE_JOB_QUEUE_SIZE = int(os.getenv("RECIPE_JOB_QUEUE_SIZE", "100"))
+# 작업 하나의 최대 실행 시간, 이보다 오래 끝나지 않은 작업은 실패로 봄 (워커 재시작 등)
+RECIPE_JOB_TIMEOUT = float(os.getenv("RECIPE_JOB_TIMEOUT", "180"))
+RECIPE_JOB_STORE = os.getenv("RECIPE_JOB_STORE", "db")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+
+class JobRejected(Exception):
+    """큐가 가득 찼거나 사용자별 동시 작업 수를 넘었을 때"""
+
+
+def new_job(kakao_id: int, video_id: str) -> dict:
+    return {
+        "id": uuid.uuid4().hex,
+        "kakao_id": kakao_id,
+        "video_id": video_id,
+        "status": QUEUED,
+        "recipe_id": None,
+        "error": None,
+        "created_at": datetime.datetime.now(),
+        "started_at": None,
+        "finished_at": None,
+    }
+
+
+class JobStore(abc.ABC):
+    """작업 상태 저장소 인터페이스. 작업은 dict로 주고받습니다."""
+
+    @abc.abstractmethod
+    async def create(self, job: dict):
+        ...
+
+    @abc.abstractmethod
+    async def get(self, job_id: str):
+        ...
+
+    @abc.abstractmethod
+    async def update(self, job_id: str, **fields):
+        ...
+
+
+class InMemoryJobStore(JobStore):
+    """프로세스 메모리에 두는 저장소 (테스트, 워커 1개용)"""
+
+    def __init__(self):
+        self._jobs = {}
+
+    async def create(self, job: dict):
+        self._jobs[job["id"]] = dict(job)
+
+    async def get(self, job_id: str):
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def update(self, job_id: str, **fields):
+        if job_id in self._jobs:
+            self._jobs[job_id].update(fields)
+
+
+class DatabaseJobStore(JobStore):
+    """recipe_jobs 테이블에 두는 저장소. 어느 워커로 조회가 들어와도 상태를 볼 수 있습니다."""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def create(self, job: dict):
+        async with self.session_factory() as db:
+            db.add(RecipeJob(**job))
+            await db.commit()
+
+    async def get(self, job_id: str):
+        async with self.session_factory() as db:
+            job = await db.get(RecipeJob, job_id)
+        if job is None:
+            return None
+        return {column.name: getattr(job, column.name) for column in RecipeJob.__table__.columns}
+
+    async def update(self, job_id: str, **fields):
+        async with self.session_factory() as db:
+            await db.execute(update(RecipeJob).where(RecipeJob.id == job_id).values(**fields))
+            await db.commit()
+
+
+def create_job_store(kind: str = RECIPE_JOB_STORE) -> JobStore:
+    if kind == "memory":
+        return InMemoryJobStore()
+    if kind == "db":
+        return DatabaseJobStore()
+    raise ValueError(f"지원하지 않는 작업 저장소입니다: {kind}")
+
+
+def job_to_dict(job: dict) -> dict:
+    def iso(value):
+        return value.isoformat() if value else None
+
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "videoId": job["video_id"],
+        "recipeId": job["recipe_id"],
+        "error": job["error"],
+        "createdAt": iso(job["created_at"]),
+        "startedAt": iso(job["started_at"]),
+        "finishedAt": iso(job["finished_at"]),
+    }
+
+
+class JobQueue:
+    """레시피 생성 작업을 bounded 큐에 넣고 정해진 수의 워커 태스크로 실행합니다.
+
+    전체 동시 실행 수는 워커 수로, 사용자별로는 대기+실행 중인 작업 수로 제한합니다.
+    runner(job)는 레시피 dict(id 포함)를 반환해야 합니다.
+    """
+
+    def __init__(
+        self,
+        runner,
+        store: JobStore = None,
+        workers: int = RECIPE_JOB_WORKERS,
+        per_user: int = RECIPE_JOB_PER_USER,
+        queue_size: int = RECIPE_JOB_QUEUE_SIZE,
+        timeout: float = RECIPE_JOB_TIMEOUT,
+    ):
+        self.runner = runner
+        self.store = store if store is not None else create_job_store()
+        self.workers = workers
+        self.per_user = per_user
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._queue = None
+        self._tasks = []
+        self._active = Counter()
+        # 이 프로세스에서 실행 중인 작업의 완료 이벤트 (SSE 대기용)
+        self._finished = {}
+        self.running = 0
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def submit(self, kakao_id: int, video_id: str, recipe_id: int = None) -> dict:
+        """작업을 등록하고 바로 반환합니다. recipe_id를 주면 이미 끝난 작업으로 기록합니다."""
+        job = new_job(kakao_id, video_id)
+        if recipe_id is not None:
+            job.update(status=SUCCEEDED, recipe_id=recipe_id, finished_at=job["created_at"])
+            await self.store.create(job)
+            return job
+
+        if self._queue is None:
+            raise JobRejected("작업 큐가 시작되지 않았습니다.")
+        if self._active[kakao_id] >= self.per_user:
+            self.rejected += 1
+            raise JobRejected(f"동시에 진행할 수 있는 레시피 생성은 {self.per_user}개까지입니다.")
+        if self._queue.full():
+            self.rejected += 1
+            raise JobRejected("레시피 생성 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+
+        await self.store.create(job)
+        self._active[kakao_id] += 1
+        self._finished[job["id"]] = asyncio.Event()
+        self._queue.put_nowait(job)
+        self.submitted += 1
+        return job
+
+    async def _run(self, job: dict):
+        self.running += 1
+        try:
+            await self.store.update(job["id"], status=RUNNING, started_at=datetime.datetime.now())
+            recipe = await asyncio.wait_for(self.runner(job), self.timeout)
+            await self.store.update(
+                job["id"], status=SUCCEEDED, recipe_id=recipe["id"], finished_at=datetime.datetime.now()
+            )
+            self.succeeded += 1
+        except Exception as e:
+            logger.error(f"레시피 생성 작업 실패 ({job['id']}): {str(e)}")
+            message = "작업 시간이 초과되었습니다." if isinstance(e, asyncio.TimeoutError) else str(e)
+            await self.store.update(
+                job["id"], status=FAILED, error=message[:500], finished_at=datetime.datetime.now()
+            )
+            self.failed += 1
+        finally:
+            self.running -= 1
+            self._active[job["kakao_id"]] -= 1
+            if self._active[job["kakao_id"]] <= 0:
+                del self._active[job["kakao_id"]]
+            finished = self._finished.pop(job["id"], None)
+            if finished is not None:
+                finished.set()
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 저장소 오류 등으로 상태 기록에 실패해도 워커는 계속 동작
+                logger.error(f"레시피 생성 작업 처리 중 오류 발생: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def get(self, job_id: str):
+        """작업 상태를 조회합니다. 제한 시간을 넘겨 끝나지 않은 작업(재시작된 워커 등)은 실패로 봅니다."""
+        job = await self.store.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATUSES:
+            return job
+        if job_id not in self._finished:
+            age = (datetime.datetime.now() - job["created_at"]).total_seconds()
+            if age > self.timeout * 2:
+                job.update(status=FAILED, error="작업이 중단되었습니다. 다시 요청해주세요.")
+        return job
+
+    async def wait(self, job_id: str, timeout: float):
+        """작업 상태가 바뀔 때까지 기다립니다. 이 프로세스의 작업이면 완료 이벤트를, 아니면 timeout만큼 쉽니다."""
+        finished = self._finished.get(job_id)
+        if finished is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(finished.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def state(self) -> dict:
+        return {
+            "store": type(self.store).__name__,
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "active_users": len(self._active),
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlalchemy import text
+
+# MySQL/MariaDB가 아닌 DB(테스트용 SQLite)에서는 프로세스 내부 락으로 대신합니다
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+_local_async_locks = {}
+
+
+def _local_lock(name: str) -> threading.Lock:
+    with _local_locks_guard:
+        return _local_locks.setdefault(name, threading.Lock())
+
+
+def _uses_get_lock(engine) -> bool:
+    return engine.dialect.name in ("mysql", "mariadb")
+
+
+@contextmanager
+def named_lock(engine, name: str, timeout: float = 0):
+    """이름 있는 DB 락 (MySQL GET_LOCK)을 잡습니다.
+
+    GET_LOCK은 연결 단위라서 세션이 커밋하며 연결을 돌려줘도 풀리지 않도록
+    락을 잡은 동안 엔진에서 전용 연결 하나를 붙잡고 있습니다.
+    timeout초 안에 잡으면 True, 아니면 False를 넘겨주며, 블록을 벗어날 때 해제합니다.
+    """
+    if _uses_get_lock(engine):
+        with engine.connect() as conn:
+            acquired = conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"), {"name": name, "timeout": timeout}
+            ).scalar() == 1
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+        return
+
+    lock = _local_lock(name)
+    acquired = lock.acquire(timeout=timeout) if timeout > 0 else lock.acquire(blocking=False)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            lock.release()
+
+
+@asynccontextmanager
+async def async_named_lock(async_engine, name: str, timeout: float = 0):
+    """named_lock의 비동기 버전. 락을 잡은 동안 전용 연결 하나를 붙잡고 있습니다."""
+    if _uses_get_lock(async_engine):
+        async with async_engine.connect() as conn:
+            acquired = (
+                await conn.execute(
+                    text("SELECT GET_LOCK(:name, :timeout)"), {"name": name, "timeout": timeout}
+                )
+            ).scalar() == 1
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+        return
+
+    lock = _local_async_locks.setdefault(name, asyncio.Lock())
+    if timeout > 0:
+        try:
+            acquired = await asyncio.wait_for(lock.acquire(), timeout)
+        except asyncio.TimeoutError:
+            acquired = False
+    elif lock.locked():
+        acquired = False
+    else:
+        acquired = await lock.acquire()
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            lock.release()
@@ -4,7 +4,7 @@ import json
 import os
 from typing import List, Any
 import logging
-import httpx
+import time
 import asyncio
 
 from dotenv import load_dotenv
@@ -19,13 +19,49 @@ from openai.types.chat import (
     ChatCompletionUserMessageParam,
     ChatCompletionMessageParam,
 )
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from starlette import status
-from starlette.responses import RedirectResponse, JSONResponse
+from starlette.responses import RedirectResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from database import engine, get_db
+from database import engine, async_engine, get_db, get_async_db, AsyncSessionLocal, insert_returning_ids, pool_status
+from query_log import query_logger
+from cache import TTLLRUCache, cache_stats
+from http_clients import http_clients
+from image_catalog import image_catalog
+from locks import named_lock
+from expiry import check_expiring_ingredients, expiry_timeline, notification_listeners
+from push import push_dispatcher, VAPID_PUBLIC_KEY
+from events import format_sse, notification_broker, publish_created_notifications, stream_notifications
+from notifications import (
+    InvalidCursor,
+    add_unread,
+    before_cursor,
+    bulk_target,
+    encode_cursor,
+    recount_unread_statement,
+)
+from scheduler import LeaseScheduler
+from search_cache import YouTubeSearchCache
+from video_metadata import video_metadata
+from jobs import FAILED, SUCCEEDED, JobQueue, JobRejected, job_to_dict
+from recipe_index import recipe_index
+from matching import RecipeMatcher
+from recipe_stream import IncrementalRecipeParser, RECIPE_STREAM_FIELDS
+from singleflight import LockedSingleFlight, SingleFlight, db_lock, flight_stats
+from retention import notification_retention
+from recipe_cache import (
+    backfill_video_ids,
+    canonical_video_url,
+    extract_video_id,
+    recipe_cache,
+    recipe_payload,
+)
 from models import Base as SQLBase, Recipe, Ingredient, User, Star, Image, Notification as NotificationModel
 from schemas import (
     MessageResponse,
@@ -38,6 +74,8 @@ from schemas import (
     StarResponse,
     Notification as NotificationSchema,
     NotificationCreate,
+    NotificationBulkRequest,
+    PushSubscriptionCreate,
 )
 
 
@@ -239,63 +277,178 @@ HAN_TO_ENG_ICON_MAP = {
     "해물믹스": "seafood_mix.svg",
 }
 
+# 아이콘 재료 이름을 기본 어휘로 쓰는 냉장고-레시피 매칭 행렬
+recipe_matcher = RecipeMatcher(vocabulary=HAN_TO_ENG_ICON_MAP)
+
+
+STARTUP_LOCK_NAME = "spring_of_dish:startup"
+STARTUP_LOCK_TIMEOUT = int(os.getenv("STARTUP_LOCK_TIMEOUT", "120"))
+
 
 def init_images(db: Session):
-    """이미지 정보를 초기화합니다."""
+    """이미지 정보를 한 번의 upsert로 초기화합니다."""
     images = [
         {"name": han, "image_url": f"/static/icon/{eng}"}
         for han, eng in HAN_TO_ENG_ICON_MAP.items()
     ]
 
-    for img_data in images:
-        existing_image = db.query(Image).filter(Image.name == img_data["name"]).first()
-        if not existing_image:
-            image = Image(**img_data)
-            db.add(image)
+    dialect = db.get_bind().dialect.name
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql_insert(Image).values(images)
+        stmt = stmt.on_duplicate_key_update(image_url=stmt.inserted.image_url)
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(Image).values(images)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Image.name], set_={"image_url": stmt.excluded.image_url}
+        )
+    else:
+        raise ValueError(f"지원하지 않는 DB입니다: {dialect}")
 
+    db.execute(stmt)
     db.commit()
 
 
-def update_ingredient_images(db: Session):
-    """기존 재료의 이미지 정보를 업데이트합니다."""
-    ingredients = db.query(Ingredient).all()
-    for ingredient in ingredients:
-        if not ingredient.image_name:
-            image = db.query(Image).filter(Image.name == ingredient.name).first()
-            if image:
-                ingredient.image_name = image.name
-                db.add(ingredient)
+def update_ingredient_images(db: Session) -> int:
+    """이미지가 비어 있는 재료를 이름이 같은 이미지와 한 번의 UPDATE로 연결합니다."""
+    result = db.execute(
+        update(Ingredient)
+        .where(Ingredient.image_name.is_(None), Ingredient.name == Image.name)
+        .values(image_name=Image.name)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def seed_images(db: Session) -> str:
+    """이미지 정보를 초기화하고 이미지가 비어 있는 재료를 연결합니다."""
+    init_images(db)
+    linked = update_ingredient_images(db)
+    return f"이미지 {len(HAN_TO_ENG_ICON_MAP)}개, 재료 {linked}개 연결"
+
+
+def backfill_recipe_video_ids(db: Session) -> str:
+    """기존 레시피에 영상 id를 채웁니다 (이미 채워져 있으면 대상 없음)."""
+    return f"레시피 {backfill_video_ids(db)}개"
+
 
+def recount_unread(db: Session) -> str:
+    """배포 시 한 번, 읽지 않은 알림 수를 실제 값으로 맞춥니다."""
+    result = db.execute(recount_unread_statement())
     db.commit()
+    return f"사용자 {result.rowcount}명"
+
+
+# 여러 워커 중 하나만 순서대로 실행하는 시작 작업 (이름, 함수)
+STARTUP_STEPS = [
+    ("이미지 초기화", seed_images),
+    ("레시피 영상 id 채우기", backfill_recipe_video_ids),
+    ("읽지 않은 알림 수 재계산", recount_unread),
+]
+
+
+def run_startup_steps_once(db: Session):
+    """여러 워커 중 락을 잡은 하나만 STARTUP_STEPS를 실행하고, 나머지는 끝날 때까지 기다립니다."""
+    with named_lock(engine, STARTUP_LOCK_NAME) as acquired:
+        if acquired:
+            for name, step in STARTUP_STEPS:
+                start = time.perf_counter()
+                result = step(db)
+                logger.info(
+                    f"시작 작업 완료 ({name}): {result}, "
+                    f"{(time.perf_counter() - start) * 1000:.1f}ms"
+                )
+            return
+
+    # 다른 워커가 시작 작업 중이면 끝날 때까지 기다린 뒤 진행
+    with named_lock(engine, STARTUP_LOCK_NAME, timeout=STARTUP_LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            logger.warning("시작 작업 대기 시간 초과, 현재 상태로 계속 진행합니다.")
 
 
-# 앱 시작 시 이미지 초기화
+# 앱 시작 시 초기화
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 실행되는 이벤트"""
+    global client
+    start = time.perf_counter()
+    client = build_openai_client()
     db = next(get_db())
     try:
-        init_images(db)
-        update_ingredient_images(db)
-        
+        run_startup_steps_once(db)
+        image_catalog.load(db)
+        db.commit()
+        # 기존 레시피로 재료 역색인 구성 (추천 API용)
+        async with AsyncSessionLocal() as adb:
+            indexed = await recipe_index.refresh(adb, force=True)
+            await recipe_matcher.refresh(adb, force=True)
+        logger.info(
+            f"서버 시작 준비 완료: 레시피 색인 {indexed}개, "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
         # 주기적으로 유통기한 체크하는 태스크 시작
-        asyncio.create_task(periodic_expiry_check())
+        # (여러 워커 중 임대를 가진 리더만 실행)
+        expiry_scheduler.start()
+        retention_scheduler.start()
+        # 알림 시각이 된 재료만 바로 확인하는 타임라인
+        expiry_timeline.start()
+        # 새 유통기한 알림을 웹 푸시로 전송
+        push_dispatcher.start()
+        # SSE 알림 스트림용 브로커
+        await notification_broker.start()
+        # 백그라운드 레시피 생성 워커
+        recipe_jobs.start()
     finally:
         db.close()
 
-async def periodic_expiry_check():
-    """주기적으로 유통기한을 체크하는 태스크"""
-    while True:
-        try:
-            db = next(get_db())
-            await check_expiring_ingredients(db)
-        except Exception as e:
-            logger.error(f"유통기한 체크 중 오류 발생: {str(e)}")
-        finally:
-            db.close()
-        
-        # 6시간마다 체크
-        await asyncio.sleep(6 * 60 * 60)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 스케줄러와 외부 API 커넥션 풀을 정리합니다."""
+    await expiry_timeline.stop()
+    await expiry_scheduler.stop()
+    await retention_scheduler.stop()
+    await push_dispatcher.stop()
+    await notification_broker.stop()
+    await recipe_jobs.stop()
+    await http_clients.aclose()
+
+
+async def periodic_expiry_check(db: AsyncSession):
+    """주기적으로 유통기한을 체크하는 작업 (타임라인이 놓친 재료를 잡는 안전망)"""
+    notifications = await check_expiring_ingredients(db)
+    logger.info(f"유통기한 체크 완료: 알림 {len(notifications)}개 생성")
+    # 다음 주기까지의 알림 시각을 다시 적재
+    await expiry_timeline.load(db)
+
+
+notification_listeners.append(push_dispatcher.enqueue_notifications)
+notification_listeners.append(publish_created_notifications)
+
+
+# 6시간마다 체크, 리더가 되면 타임라인을 바로 적재
+expiry_scheduler = LeaseScheduler(
+    "expiry_check",
+    interval=int(os.getenv("EXPIRY_CHECK_INTERVAL", str(6 * 60 * 60))),
+    job=periodic_expiry_check,
+    on_elected=expiry_timeline.load,
+)
+
+
+async def periodic_notification_retention(db: AsyncSession):
+    """오래된 알림을 정책에 따라 보관/삭제하는 작업"""
+    report = await notification_retention.run(db)
+    logger.info(f"알림 정리 완료: {report['reclaimed']}행 삭제 ({report['elapsed_ms']}ms)")
+
+
+# 하루 한 번, 리더 워커에서만 실행
+# (청크 정리는 기본 임대 60초보다 오래 걸릴 수 있으므로 임대를 길게 잡음)
+retention_scheduler = LeaseScheduler(
+    "notification_retention",
+    interval=int(os.getenv("NOTIFICATION_RETENTION_INTERVAL", str(24 * 60 * 60))),
+    job=periodic_notification_retention,
+    lease_ttl=int(os.getenv("NOTIFICATION_RETENTION_LEASE_TTL", str(30 * 60))),
+)
 
 
 # __________________________________________________________
@@ -325,9 +478,27 @@ kauth_host = "https://kauth.kakao.com"
 kapi_host = "https://kapi.kakao.com"
 openai_host = "https://api.openai.com/v1"
 message_template = '{"object_type":"text","text":"Hello, world!","link":{"web_url":"https://developers.kakao.com","mobile_web_url":"https://developers.kakao.com"}}'
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def build_openai_client() -> AsyncOpenAI:
+    """공유 커넥션 풀(닫혔으면 새로 만든 것)에 묶인 OpenAI 클라이언트를 만듭니다."""
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"), http_client=http_clients.get("openai")
+    )
+
+
+# shutdown에서 풀이 닫히므로 startup_event에서 다시 만듭니다
+client = build_openai_client()
+
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
+# 인증된 사용자 캐시 (kakao_id -> UserResponse), 로그인 시 무효화
+user_cache = TTLLRUCache(
+    "users",
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "300")),
+)
+
 
 def create_jwt_token(data: dict, expires_delta: datetime.timedelta | None = None):
     to_encode = data.copy()
@@ -414,7 +585,7 @@ async def validate_jwt_token(jwt_token: str) -> dict:
 
 
 async def get_current_user(
-    request: Request, db: Session = Depends(get_db)  # ↓ HTTPBearer 대신 Request 사용
+    request: Request, db: AsyncSession = Depends(get_async_db)  # ↓ HTTPBearer 대신 Request 사용
 ) -> UserResponse:
     token = request.cookies.get("token")  # 쿠키에서 꺼내기
     if not token:
@@ -422,15 +593,21 @@ async def get_current_user(
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         kakao_id = int(payload["sub"].strip("'"))
-        user = db.query(User).filter(User.kakao_id == kakao_id).first()
+        cached = user_cache.get(kakao_id)
+        if cached is not None:
+            return cached
+
+        user = await db.scalar(select(User).where(User.kakao_id == kakao_id))
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
-        return UserResponse(
+        current_user = UserResponse(
             kakao_id=user.kakao_id,
             nickname=user.nickname,
             profile_image=user.profile_image,
             created_at=user.created_at,
         )
+        user_cache.set(kakao_id, current_user)
+        return current_user
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
@@ -440,15 +617,14 @@ async def call_kakao_api(
 ) -> dict:
     """카카오 API를 호출합니다."""
     try:
-        async with httpx.AsyncClient() as ac:
-            response = await ac.request(
-                method=method,
-                url=f"{kapi_host}{endpoint}",
-                headers={"Authorization": f"Bearer {data.get('kakao_access_token')}"},
-                data=data,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await http_clients.get("kakao").request(
+            method=method,
+            url=f"{kapi_host}{endpoint}",
+            headers={"Authorization": f"Bearer {data.get('kakao_access_token')}"},
+            data=data,
+        )
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -484,7 +660,7 @@ async def authorize(request: Request) -> RedirectResponse:
 
 @app.get("/redirect")
 @handle_db_operation("로그인")
-async def redirect(request: Request, db: Session = Depends(get_db)) -> JSONResponse:
+async def redirect(request: Request, db: AsyncSession = Depends(get_async_db)) -> JSONResponse:
     """카카오 로그인 콜백 처리"""
     code = request.query_params.get("code")
     if not code:
@@ -503,77 +679,78 @@ async def redirect(request: Request, db: Session = Depends(get_db)) -> JSONRespo
         "code": code,
     }
 
-    async with httpx.AsyncClient() as ac:
-        token_resp = await ac.post(token_url, data=data)
-        token_json = token_resp.json()
-        access_token = token_json.get("access_token")
-
-        if not access_token:
-            logger.error(f"Failed to get access token: {token_json}")
-            return JSONResponse(
-                {"error": "Failed to get access token", "detail": token_json},
-                status_code=400,
-            )
-
-        headers = {"Authorization": f"Bearer {access_token}"}
-        profile_resp = await ac.get(f"{kapi_host}/v2/user/me", headers=headers)
-        if profile_resp.status_code != 200:
-            logger.error(
-                f"Failed to get user profile: {profile_resp.status_code} {profile_resp.text}"
-            )
-            return JSONResponse(
-                {"error": "Failed to get user profile"}, status_code=400
-            )
+    ac = http_clients.get("kakao")
+    token_resp = await ac.post(token_url, data=data)
+    token_json = token_resp.json()
+    access_token = token_json.get("access_token")
 
-        profile_data = profile_resp.json()
-        kakao_id = profile_data["id"]
-        nickname = profile_data.get("properties", {}).get("nickname", "")
-        profile_image = profile_data.get("properties", {}).get("profile_image", "")
-
-        # 사용자 정보 저장 또는 업데이트
-        user = db.query(User).filter(User.kakao_id == kakao_id).first()
-        if user:
-            # 기존 사용자의 경우 닉네임과 프로필 이미지만 업데이트
-            user.nickname = nickname
-            user.profile_image = profile_image
-        else:
-            # 새로운 사용자의 경우 created_at 포함하여 생성
-            user = User(
-                kakao_id=kakao_id,
-                nickname=nickname,
-                profile_image=profile_image,
-                created_at=datetime.datetime.now(),
-            )
-            db.add(user)
-            logger.info(f"New user added: {user}")
-        db.commit()
-
-        # response = RedirectResponse(url=state)
+    if not access_token:
+        logger.error(f"Failed to get access token: {token_json}")
+        return JSONResponse(
+            {"error": "Failed to get access token", "detail": token_json},
+            status_code=400,
+        )
 
-        jwt_token = create_jwt_token(
-            {
-                "sub": repr(kakao_id),
-                "kakao_access_token": access_token,
-                "nickname": nickname,
-                "profile_image": profile_image,
-            }
+    headers = {"Authorization": f"Bearer {access_token}"}
+    profile_resp = await ac.get(f"{kapi_host}/v2/user/me", headers=headers)
+    if profile_resp.status_code != 200:
+        logger.error(
+            f"Failed to get user profile: {profile_resp.status_code} {profile_resp.text}"
+        )
+        return JSONResponse(
+            {"error": "Failed to get user profile"}, status_code=400
         )
-        logger.info(f"JWT token created: {jwt_token}")
-
-        # return JSONResponse({"token": jwt_token}, status_code=200)
-        # 쿠키저장에 jwt json
-
-        response = RedirectResponse(url="https://areono.store/home")
-        response.set_cookie(
-            key="token",
-            value=jwt_token,
-            httponly=True,
-            secure=True,  # JavaScript에서 접근 못 함
-            samesite="None",
-            max_age=60 * 60 * 24 * 1,  # 7일
-            path="/",
+
+    profile_data = profile_resp.json()
+    kakao_id = profile_data["id"]
+    nickname = profile_data.get("properties", {}).get("nickname", "")
+    profile_image = profile_data.get("properties", {}).get("profile_image", "")
+
+    # 사용자 정보 저장 또는 업데이트
+    user = await db.scalar(select(User).where(User.kakao_id == kakao_id))
+    if user:
+        # 기존 사용자의 경우 닉네임과 프로필 이미지만 업데이트
+        user.nickname = nickname
+        user.profile_image = profile_image
+    else:
+        # 새로운 사용자의 경우 created_at 포함하여 생성
+        user = User(
+            kakao_id=kakao_id,
+            nickname=nickname,
+            profile_image=profile_image,
+            created_at=datetime.datetime.now(),
         )
-        return response
+        db.add(user)
+        logger.info(f"New user added: {user}")
+    await db.commit()
+    user_cache.invalidate(kakao_id)
+
+    # response = RedirectResponse(url=state)
+
+    jwt_token = create_jwt_token(
+        {
+            "sub": repr(kakao_id),
+            "kakao_access_token": access_token,
+            "nickname": nickname,
+            "profile_image": profile_image,
+        }
+    )
+    logger.info(f"JWT token created: {jwt_token}")
+
+    # return JSONResponse({"token": jwt_token}, status_code=200)
+    # 쿠키저장에 jwt json
+
+    response = RedirectResponse(url="https://areono.store/home")
+    response.set_cookie(
+        key="token",
+        value=jwt_token,
+        httponly=True,
+        secure=True,  # JavaScript에서 접근 못 함
+        samesite="None",
+        max_age=60 * 60 * 24 * 1,  # 7일
+        path="/",
+    )
+    return response
 
 
 @app.get("/profile", response_model=UserResponse)
@@ -618,19 +795,18 @@ async def profile(
 @handle_db_operation("재료 조회")
 async def get_user_ingredients(
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> IngredientsResponse:
     """사용자의 재료 목록을 조회합니다."""
     ingredients = (
-        db.query(Ingredient)
-        .options(joinedload(Ingredient.image))
-        .filter(
-            Ingredient.kakao_id == current_user.kakao_id,
-            Ingredient.added_date <= datetime.datetime.now(),
-            Ingredient.limit_date >= datetime.datetime.now(),
+        await db.scalars(
+            select(Ingredient).where(
+                Ingredient.kakao_id == current_user.kakao_id,
+                Ingredient.added_date <= datetime.datetime.now(),
+                Ingredient.limit_date >= datetime.datetime.now(),
+            )
         )
-        .all()
-    )
+    ).all()
 
     return IngredientsResponse(
         ingredients=[ingredient.to_dict() for ingredient in ingredients]
@@ -642,26 +818,24 @@ async def get_user_ingredients(
 async def add_ingredient(
     ingredient: IngredientCreate,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> IngredientResponse:
     """새로운 재료를 추가합니다."""
     try:
-        # 재료 이름으로 이미지 찾기
-        image = db.query(Image).filter(Image.name == ingredient.name).first()
-
-        image_name = HAN_TO_ENG_ICON_MAP.get(ingredient.name)
-        image_url = f"/static/icon/{image_name}" if image_name else None
+        # 재료 이름으로 이미지 찾기 (메모리 카탈로그)
+        image_url = image_catalog.url_for(ingredient.name)
 
-        new_ingredient = Ingredient.create(
+        new_ingredient = await Ingredient.create(
             db=db,
             name=ingredient.name,
             category=ingredient.category,
             added_date=ingredient.added_date,
             kakao_id=current_user.kakao_id,
-            image_name=image.name if image else None,
+            image_name=ingredient.name if image_url else None,
         )
-        db.commit()
-        db.refresh(new_ingredient)
+        await db.commit()
+        await db.refresh(new_ingredient)
+        expiry_timeline.schedule(new_ingredient.id, new_ingredient.limit_date)
 
         return IngredientResponse(
             id=int(getattr(new_ingredient, "id")),
@@ -674,30 +848,90 @@ async def add_ingredient(
             image_url=image_url,
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise create_error_response(
             f"재료 추가 중 오류가 발생했습니다: {str(e)}",
             status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
 
+MAX_INGREDIENT_BATCH = 100
+
+
+async def bulk_insert_ingredients(db: AsyncSession, rows: List[dict]) -> List[int]:
+    """재료를 한 번의 INSERT로 추가하고 생성된 id 목록을 입력 순서대로 반환합니다."""
+    return await insert_returning_ids(db, Ingredient, rows)
+
+
+@app.post("/ingredients/batch", response_model=List[IngredientResponse])
+@handle_db_operation("재료 일괄 추가")
+async def add_ingredients_batch(
+    ingredients: List[IngredientCreate],
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[IngredientResponse]:
+    """여러 재료를 하나의 트랜잭션으로 추가합니다."""
+    if not (1 <= len(ingredients) <= MAX_INGREDIENT_BATCH):
+        raise create_error_response(
+            f"재료는 한 번에 1~{MAX_INGREDIENT_BATCH}개까지 추가할 수 있습니다.",
+            status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        rows = [
+            {
+                "name": ingredient.name,
+                "category": ingredient.category,
+                "added_date": ingredient.added_date,
+                "limit_date": ingredient.added_date + datetime.timedelta(days=15),
+                "kakao_id": current_user.kakao_id,
+                "image_name": ingredient.name if ingredient.name in image_catalog else None,
+            }
+            for ingredient in ingredients
+        ]
+        ids = await bulk_insert_ingredients(db, rows)
+        await db.commit()
+        for ingredient_id, row in zip(ids, rows):
+            expiry_timeline.schedule(ingredient_id, row["limit_date"])
+
+        responses = []
+        for ingredient_id, row in zip(ids, rows):
+            new_ingredient = Ingredient(**row)
+            responses.append(
+                IngredientResponse(
+                    id=ingredient_id,
+                    name=row["name"],
+                    category=row["category"],
+                    added_date=row["added_date"],
+                    limit_date=row["limit_date"],
+                    is_expired=new_ingredient.is_expired,
+                    days_until_expiry=new_ingredient.days_until_expiry,
+                    image_url=image_catalog.url_for(row["image_name"]),
+                )
+            )
+        return responses
+    except Exception as e:
+        await db.rollback()
+        raise create_error_response(
+            f"재료 일괄 추가 중 오류가 발생했습니다: {str(e)}",
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @app.put("/ingredients/{ingredient_id}", response_model=IngredientResponse)
 @handle_db_operation("재료 수정")
 async def update_ingredient(
     ingredient_id: int,
     ingredient: IngredientUpdate,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> IngredientResponse:
     """재료 정보를 수정합니다."""
     try:
-        db_ingredient = (
-            db.query(Ingredient)
-            .filter(
+        db_ingredient = await db.scalar(
+            select(Ingredient).where(
                 Ingredient.id == ingredient_id,
                 Ingredient.kakao_id == current_user.kakao_id,
             )
-            .first()
         )
 
         if not db_ingredient:
@@ -713,8 +947,7 @@ async def update_ingredient(
             db_ingredient.limit_date = ingredient.limit_date
         # 이미지 이름이 제공된 경우 해당 이미지가 존재하는지 확인
         if ingredient.image_name is not None:
-            image = db.query(Image).filter(Image.name == ingredient.image_name).first()
-            if not image:
+            if ingredient.image_name not in image_catalog:
                 raise create_error_response(
                     f"이미지 '{ingredient.image_name}'을 찾을 수 없습니다",
                     status.HTTP_400_BAD_REQUEST,
@@ -723,8 +956,9 @@ async def update_ingredient(
         if ingredient.is_frozen is not None:
             db_ingredient.is_frozen = ingredient.is_frozen
 
-        db.commit()
-        db.refresh(db_ingredient)
+        await db.commit()
+        await db.refresh(db_ingredient)
+        expiry_timeline.schedule(db_ingredient.id, db_ingredient.limit_date)
 
         return IngredientResponse(
             id=db_ingredient.id,
@@ -735,10 +969,10 @@ async def update_ingredient(
             is_frozen=db_ingredient.is_frozen,
             is_expired=db_ingredient.is_expired,
             days_until_expiry=db_ingredient.days_until_expiry,
-            image_url=db_ingredient.image.image_url if db_ingredient.image else None,
+            image_url=image_catalog.url_for(db_ingredient.image_name),
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"재료 수정 실패: {str(e)}")
         raise HTTPException(
             status_code=500, detail=f"재료 수정 중 오류가 발생했습니다: {str(e)}"
@@ -750,15 +984,13 @@ async def update_ingredient(
 async def delete_ingredient(
     ingredient_id: int,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> MessageResponse:
     """재료를 삭제합니다."""
-    db_ingredient = (
-        db.query(Ingredient)
-        .filter(
+    db_ingredient = await db.scalar(
+        select(Ingredient).where(
             Ingredient.id == ingredient_id, Ingredient.kakao_id == current_user.kakao_id
         )
-        .first()
     )
 
     if not db_ingredient:
@@ -766,8 +998,9 @@ async def delete_ingredient(
             "재료를 찾을 수 없습니다", status.HTTP_404_NOT_FOUND
         )
 
-    db.delete(db_ingredient)
-    db.commit()
+    await db.delete(db_ingredient)
+    await db.commit()
+    expiry_timeline.remove(ingredient_id)
 
     return MessageResponse(message="재료가 삭제되었습니다")
 
@@ -776,12 +1009,14 @@ async def delete_ingredient(
 @handle_db_operation("레시피 조회")
 async def get_recipes(
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> List[RecipeResponse]:
     """사용자가 좋아요를 누른 레시피 목록을 조회합니다."""
     recipes = (
-        db.query(Recipe).join(Star).filter(Star.kakao_id == current_user.kakao_id).all()
-    )
+        await db.scalars(
+            select(Recipe).join(Star).where(Star.kakao_id == current_user.kakao_id)
+        )
+    ).all()
 
     recipe_list = [
         RecipeResponse(
@@ -800,13 +1035,116 @@ async def get_recipes(
     return recipe_list
 
 
+RECOMMENDATION_MAX_LIMIT = 50
+
+
+def validate_recommendation_limit(limit: int):
+    if not (1 <= limit <= RECOMMENDATION_MAX_LIMIT):
+        raise create_error_response(
+            f"limit은 1~{RECOMMENDATION_MAX_LIMIT} 사이여야 합니다.", status.HTTP_400_BAD_REQUEST
+        )
+
+
+async def load_fridge(db: AsyncSession, kakao_id: int, now: datetime.datetime) -> list:
+    """지금 냉장고에 있는(유통기한이 지나지 않은) 재료의 (이름, 유통기한) 목록"""
+    return (
+        await db.execute(
+            select(Ingredient.name, Ingredient.limit_date).where(
+                Ingredient.kakao_id == kakao_id,
+                Ingredient.added_date <= now,
+                Ingredient.limit_date >= now,
+            )
+        )
+    ).all()
+
+
+async def load_recipes_by_id(db: AsyncSession, recipe_ids: list) -> dict:
+    if not recipe_ids:
+        return {}
+    return {
+        recipe.id: recipe
+        for recipe in (await db.scalars(select(Recipe).where(Recipe.id.in_(recipe_ids)))).all()
+    }
+
+
+@app.get("/recipes/recommendations")
+@handle_db_operation("레시피 추천")
+async def recommend_recipes(
+    limit: int = 10,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """냉장고 재료로 만들 수 있는 기존 레시피를 재료 충족률 순으로 추천합니다 (외부 API 호출 없음)."""
+    validate_recommendation_limit(limit)
+    fridge = [
+        name for name, _ in await load_fridge(db, current_user.kakao_id, datetime.datetime.now())
+    ]
+
+    # 다른 워커가 새로 저장한 레시피 반영 (주기마다 새 id만 조회)
+    await recipe_index.refresh(db)
+    ranked = recipe_index.rank(fridge, limit)
+    recipes = await load_recipes_by_id(db, [r[0] for r in ranked])
+
+    recommendations = []
+    for recipe_id, coverage, matched, total in ranked:
+        recipe = recipes.get(recipe_id)
+        if recipe is None:
+            continue
+        have, missing = recipe_index.matched_ingredients(recipe.ingredients, fridge)
+        recommendations.append({
+            **recipe_response(recipe_payload(recipe)),
+            "coverage": round(coverage, 4),
+            "matchedCount": matched,
+            "ingredientCount": total,
+            "matchedIngredients": have,
+            "missingIngredients": missing,
+        })
+
+    return create_json_response({"recipes": recommendations})
+
+
+@app.get("/recipes/fridge-matches")
+@handle_db_operation("냉장고 레시피 매칭")
+async def match_fridge_recipes(
+    limit: int = 10,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """냉장고 재료와 양념으로 모든 저장된 레시피의 점수를 계산해 상위 레시피를 반환합니다.
+
+    유통기한이 가까운 재료를 쓰는 레시피일수록 점수가 높습니다.
+    """
+    validate_recommendation_limit(limit)
+    now = datetime.datetime.now()
+    fridge = await load_fridge(db, current_user.kakao_id, now)
+
+    await recipe_matcher.refresh(db)
+    matches = recipe_matcher.top_k(
+        [(name, (limit_date - now).days if limit_date else None) for name, limit_date in fridge],
+        limit,
+    )
+    recipes = await load_recipes_by_id(db, [m[0] for m in matches])
+
+    return create_json_response({
+        "recipes": [
+            {
+                **recipe_response(recipe_payload(recipes[recipe_id])),
+                "score": round(score, 4),
+                "coverage": round(coverage, 4),
+            }
+            for recipe_id, score, coverage in matches
+            if recipe_id in recipes
+        ]
+    })
+
+
 @app.get("/recipes/{recipe_id}", response_model=RecipeResponse)
 @handle_db_operation("레시피 조회")
 async def get_recipe_detail(
-    recipe_id: int, db: Session = Depends(get_db)
+    recipe_id: int, db: AsyncSession = Depends(get_async_db)
 ) -> RecipeResponse:
     """특정 레시피의 상세 정보를 조회합니다."""
-    recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
+    recipe = await db.scalar(select(Recipe).where(Recipe.id == recipe_id))
     if not recipe:
         raise create_error_response(
             "레시피를 찾을 수 없습니다", status.HTTP_404_NOT_FOUND
@@ -829,22 +1167,22 @@ async def get_recipe_detail(
 async def toggle_star(
     recipe_id: int,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> StarResponse:
     """레시피에 좋아요를 토글합니다."""
     try:
         # 레시피가 존재하는지 확인
-        recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
+        recipe = await db.scalar(select(Recipe).where(Recipe.id == recipe_id))
         if not recipe:
             raise create_error_response(
                 "레시피를 찾을 수 없습니다", status.HTTP_404_NOT_FOUND
             )
 
         # 이미 좋아요를 눌렀는지 확인
-        existing_star = (
-            db.query(Star)
-            .filter(Star.recipe_id == recipe.id, Star.kakao_id == current_user.kakao_id)
-            .first()
+        existing_star = await db.scalar(
+            select(Star).where(
+                Star.recipe_id == recipe.id, Star.kakao_id == current_user.kakao_id
+            )
         )
 
         if existing_star:
@@ -854,8 +1192,8 @@ async def toggle_star(
                 kakao_id=int(getattr(existing_star, "kakao_id")),
                 created_at=getattr(existing_star, "created_at"),
             )
-            db.delete(existing_star)
-            db.commit()
+            await db.delete(existing_star)
+            await db.commit()
             return star_data
         else:
             # 좋아요 추가
@@ -866,22 +1204,22 @@ async def toggle_star(
             )
             db.add(new_star)
             try:
-                db.commit()
-                db.refresh(new_star)
+                await db.commit()
+                await db.refresh(new_star)
                 return StarResponse(
                     recipe_id=int(getattr(new_star, "recipe_id")),
                     kakao_id=int(getattr(new_star, "kakao_id")),
                     created_at=getattr(new_star, "created_at"),
                 )
             except IntegrityError:
-                db.rollback()
+                await db.rollback()
                 raise create_error_response(
                     "이미 좋아요를 누른 레시피입니다", status.HTTP_400_BAD_REQUEST
                 )
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise create_error_response(
             f"좋아요 처리 중 오류가 발생했습니다: {str(e)}",
             status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -907,50 +1245,50 @@ async def search_youtube_video(query: str) -> List[dict]:
             "order": "relevance",  # 관련성 순으로 정렬
         }
 
-        async with httpx.AsyncClient() as ac:
-            response = await ac.get(url, params=params)
-            response.raise_for_status()
+        ac = http_clients.get("youtube")
+        response = await ac.get(url, params=params)
+        response.raise_for_status()
+
+        try:
+            data = response.json()
+        except json.JSONDecodeError as e:
+            raise ValueError(f"YouTube API 응답을 파싱할 수 없습니다: {str(e)}")
+
+        if "error" in data:
+            error_message = data["error"].get("message", "Unknown error")
+            raise ValueError(f"YouTube API 오류: {error_message}")
+
+        if "items" not in data or not data["items"]:
+            return []
 
+        results = []
+        for item in data["items"]:
             try:
-                data = response.json()
-            except json.JSONDecodeError as e:
-                raise ValueError(f"YouTube API 응답을 파싱할 수 없습니다: {str(e)}")
-
-            if "error" in data:
-                error_message = data["error"].get("message", "Unknown error")
-                raise ValueError(f"YouTube API 오류: {error_message}")
-
-            if "items" not in data or not data["items"]:
-                return []
-
-            results = []
-            for item in data["items"]:
-                try:
-                    if not isinstance(item, dict):
-                        continue
-
-                    video_id = item.get("id", {}).get("videoId")
-                    snippet = item.get("snippet", {})
-                    thumbnails = snippet.get("thumbnails", {})
-                    high_thumbnail = thumbnails.get("high", {})
-
-                    if not all([video_id, snippet, high_thumbnail]):
-                        continue
-
-                    video_data = {
-                        "video_id": video_id,
-                        "title": snippet.get("title", ""),
-                        "thumbnail": high_thumbnail.get("url", ""),
-                        "url": f"https://www.youtube.com/watch?v={video_id}",
-                    }
-
-                    # 필수 필드가 모두 있는지 확인
-                    if all(video_data.values()):
-                        results.append(video_data)
-                except Exception as e:
+                if not isinstance(item, dict):
                     continue
 
-            return results
+                video_id = item.get("id", {}).get("videoId")
+                snippet = item.get("snippet", {})
+                thumbnails = snippet.get("thumbnails", {})
+                high_thumbnail = thumbnails.get("high", {})
+
+                if not all([video_id, snippet, high_thumbnail]):
+                    continue
+
+                video_data = {
+                    "video_id": video_id,
+                    "title": snippet.get("title", ""),
+                    "thumbnail": high_thumbnail.get("url", ""),
+                    "url": f"https://www.youtube.com/watch?v={video_id}",
+                }
+
+                # 필수 필드가 모두 있는지 확인
+                if all(video_data.values()):
+                    results.append(video_data)
+            except Exception as e:
+                continue
+
+        return results
 
     except Exception as e:
         raise ValueError(f"YouTube 검색 중 오류 발생: {str(e)}")
@@ -962,63 +1300,37 @@ async def get_video_metadata(video_url: str) -> dict:
         if not YOUTUBE_API_KEY:
             raise ValueError("YouTube API 키가 설정되지 않았습니다.")
 
-        # URL에서 video_id 추출
-        if "youtube.com/watch?v=" in video_url:
-            video_id = video_url.split("watch?v=")[-1].split("&")[0]
-        elif "youtube.com/shorts/" in video_url:
-            video_id = video_url.split("shorts/")[-1].split("?")[0]
-        else:
-            raise ValueError(f"지원하지 않는 YouTube URL 형식입니다: {video_url}")
-
-        url = "https://www.googleapis.com/youtube/v3/videos"
-        params = {"part": "snippet", "id": video_id, "key": YOUTUBE_API_KEY}
+        # URL에서 video_id 추출 (watch, shorts, youtu.be)
+        video_id = extract_video_id(video_url)
 
-        async with httpx.AsyncClient() as ac:
-            response = await ac.get(url, params=params)
-            response.raise_for_status()
+        # 검색 직후 prefetch된 메타데이터가 있으면 YouTube를 다시 호출하지 않음
+        item = await video_metadata.get(video_id)
+        if item is None:
+            raise ValueError(f"비디오를 찾을 수 없습니다. (ID: {video_id})")
 
-            try:
-                data = response.json()
-            except json.JSONDecodeError as e:
-                raise ValueError(f"YouTube API 응답을 파싱할 수 없습니다: {str(e)}")
-
-            if "error" in data:
-                error_message = data["error"].get("message", "Unknown error")
-                raise ValueError(f"YouTube API 오류: {error_message}")
-
-            if "items" not in data or not data["items"]:
-                raise ValueError(f"비디오를 찾을 수 없습니다. (ID: {video_id})")
-
-            item = data["items"][0].get("snippet", {})
-            if not item:
-                raise ValueError("비디오 정보가 올바르지 않습니다.")
-
-            metadata = {
-                "title": item.get("title", ""),
-                "description": item.get("description", ""),
-                "tags": item.get("tags", []),
-                "url": video_url,
-            }
+        metadata = {
+            "title": item.get("title", ""),
+            "description": item.get("description", ""),
+            "tags": item.get("tags", []),
+            "url": video_url,
+        }
 
-            # 필수 필드 검증
-            if not metadata["title"]:
-                raise ValueError("비디오 제목을 찾을 수 없습니다.")
+        # 필수 필드 검증
+        if not metadata["title"]:
+            raise ValueError("비디오 제목을 찾을 수 없습니다.")
 
-            return metadata
+        return metadata
 
     except Exception as e:
         raise ValueError(f"비디오 메타데이터 가져오기 실패: {str(e)}")
 
 
-async def generate_recipe_with_gpt(video_url: str) -> dict:
-    """GPT API를 사용하여 YouTube 영상의 레시피를 분석하고 생성합니다."""
-    try:
-        # 비디오 메타데이터 가져오기
-        metadata = await get_video_metadata(video_url)
-        if not metadata:
-            raise ValueError("비디오 정보를 가져올 수 없습니다.")
+def build_recipe_messages(metadata: dict, video_url: str) -> List[ChatCompletionMessageParam]:
+    """영상 메타데이터로 레시피 생성 프롬프트를 만듭니다.
 
-        prompt = f"""다음 YouTube 영상의 정보를 바탕으로 요리 레시피를 생성해주세요.
+    스트리밍에서 재료 목록을 단계보다 먼저 보여줄 수 있도록 steps를 마지막에 둡니다.
+    """
+    prompt = f"""다음 YouTube 영상의 정보를 바탕으로 요리 레시피를 생성해주세요.
 
 영상 제목: {metadata['title']}
 영상 설명: {metadata['description']}
@@ -1029,11 +1341,6 @@ async def generate_recipe_with_gpt(video_url: str) -> dict:
     "recipe": {{
         "title": "한국어 요리 제목 (2-50자)",
         "subtitle": "한국어로 된 간단한 설명 (10-100자)",
-        "steps": [
-            "한국어로 된 1단계 설명 (20자 이상)",
-            "한국어로 된 2단계 설명 (20자 이상)",
-            "한국어로 된 3단계 설명 (20자 이상)"
-        ],
         "ingredients": [
             "한국어로 된 재료 1",
             "한국어로 된 재료 2",
@@ -1044,86 +1351,142 @@ async def generate_recipe_with_gpt(video_url: str) -> dict:
             "한국어로 된 양념 2",
             "한국어로 된 양념 3"
         ],
+        "steps": [
+            "한국어로 된 1단계 설명 (20자 이상)",
+            "한국어로 된 2단계 설명 (20자 이상)",
+            "한국어로 된 3단계 설명 (20자 이상)"
+        ],
         "youtube_url": "{video_url}"
     }}
 }}"""
 
-        system_message: ChatCompletionSystemMessageParam = {
-            "role": "system",
-            "content": """당신은 한국 요리 전문가입니다.
+    system_message: ChatCompletionSystemMessageParam = {
+        "role": "system",
+        "content": """당신은 한국 요리 전문가입니다.
 주어진 YouTube 영상의 정보를 바탕으로 상세한 요리 레시피를 생성해주세요.
 모든 설명은 반드시 한국어로 작성해주세요.
 레시피는 실용적이고 따라하기 쉬워야 합니다.
 영상의 제목, 설명, 태그를 바탕으로 재료와 양념을 정확히 파악하고 설명해주세요.
 반드시 요청된 JSON 형식을 정확히 지켜주세요.
 다른 설명이나 텍스트는 포함하지 마세요.""",
-        }
-        user_message: ChatCompletionUserMessageParam = {
-            "role": "user",
-            "content": prompt,
-        }
-        messages: List[ChatCompletionMessageParam] = [system_message, user_message]
+    }
+    user_message: ChatCompletionUserMessageParam = {
+        "role": "user",
+        "content": prompt,
+    }
+    return [system_message, user_message]
 
-        response = await client.chat.completions.create(
-            model="gpt-4.1",
-            messages=messages,
-            temperature=0.3,
-            max_tokens=2000,
-            response_format={"type": "json_object"},
-        )
 
-        content = response.choices[0].message.content.strip()
+def validate_recipe(content: str) -> dict:
+    """GPT 응답 JSON을 파싱하고 레시피 형식을 검증한 뒤 recipe 객체를 반환합니다."""
+    try:
+        recipe_data = json.loads(content)
+        if not isinstance(recipe_data, dict) or "recipe" not in recipe_data:
+            raise ValueError("Invalid recipe data format: missing 'recipe' key")
+
+        recipe = recipe_data["recipe"]
+        required_fields = [
+            "title",
+            "subtitle",
+            "steps",
+            "ingredients",
+            "seasonings",
+            "youtube_url",
+        ]
+        missing_fields = [field for field in required_fields if field not in recipe]
+        if missing_fields:
+            raise ValueError(
+                f"Missing required fields in recipe: {', '.join(missing_fields)}"
+            )
 
-        try:
-            recipe_data = json.loads(content)
-            if not isinstance(recipe_data, dict) or "recipe" not in recipe_data:
-                raise ValueError("Invalid recipe data format: missing 'recipe' key")
-
-            recipe = recipe_data["recipe"]
-            required_fields = [
-                "title",
-                "subtitle",
-                "steps",
-                "ingredients",
-                "seasonings",
-                "youtube_url",
-            ]
-            missing_fields = [field for field in required_fields if field not in recipe]
-            if missing_fields:
+        # 한국어 검증 로직
+        def contains_korean(text):
+            return any(ord("가") <= ord(c) <= ord("힣") for c in text)
+
+        if not contains_korean(recipe["title"]):
+            raise ValueError("Recipe title must contain Korean characters")
+
+        # 단계 설명 검증
+        if len(recipe["steps"]) < 3:
+            raise ValueError("Recipe must have at least 3 steps")
+
+        for step in recipe["steps"]:
+            if not contains_korean(step):
+                raise ValueError("Recipe steps must be in Korean")
+            if len(step) < 20:
                 raise ValueError(
-                    f"Missing required fields in recipe: {', '.join(missing_fields)}"
+                    "Recipe step description must be at least 20 characters"
                 )
 
-            # 한국어 검증 로직
-            def contains_korean(text):
-                return any(ord("가") <= ord(c) <= ord("힣") for c in text)
+        return recipe
 
-            if not contains_korean(recipe["title"]):
-                raise ValueError("Recipe title must contain Korean characters")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"GPT API 응답을 파싱할 수 없습니다: {str(e)}")
+    except ValueError as e:
+        raise ValueError(f"레시피 데이터 형식이 올바르지 않습니다: {str(e)}")
 
-            # 단계 설명 검증
-            if len(recipe["steps"]) < 3:
-                raise ValueError("Recipe must have at least 3 steps")
 
-            for step in recipe["steps"]:
-                if not contains_korean(step):
-                    raise ValueError("Recipe steps must be in Korean")
-                if len(step) < 20:
-                    raise ValueError(
-                        "Recipe step description must be at least 20 characters"
-                    )
+async def generate_recipe_with_gpt(video_url: str) -> dict:
+    """GPT API를 사용하여 YouTube 영상의 레시피를 분석하고 생성합니다."""
+    try:
+        # 비디오 메타데이터 가져오기
+        metadata = await get_video_metadata(video_url)
+        if not metadata:
+            raise ValueError("비디오 정보를 가져올 수 없습니다.")
 
-            return {"status": "success", "recipe": recipe}
+        response = await client.chat.completions.create(
+            model="gpt-4.1",
+            messages=build_recipe_messages(metadata, video_url),
+            temperature=0.3,
+            max_tokens=2000,
+            response_format={"type": "json_object"},
+        )
 
-        except json.JSONDecodeError as e:
-            raise ValueError(f"GPT API 응답을 파싱할 수 없습니다: {str(e)}")
-        except ValueError as e:
-            raise ValueError(f"레시피 데이터 형식이 올바르지 않습니다: {str(e)}")
+        recipe = validate_recipe(response.choices[0].message.content.strip())
+        return {
+            "status": "success",
+            "recipe": recipe,
+            "usage": response.usage.total_tokens if response.usage else None,
+        }
 
     except Exception as e:
         raise ValueError(f"레시피 생성 중 오류가 발생했습니다: {str(e)}")
 
 
+async def stream_recipe_with_gpt(video_url: str):
+    """OpenAI 스트리밍으로 레시피를 생성하며, 완성된 필드부터 (이벤트, 값)을 내보냅니다.
+
+    마지막에 ("result", {"recipe", "usage"})를 내보내며, 이 recipe는 validate_recipe를 통과한 것입니다.
+    """
+    metadata = await get_video_metadata(video_url)
+    parser = IncrementalRecipeParser()
+    usage = None
+    stream = await client.chat.completions.create(
+        model="gpt-4.1",
+        messages=build_recipe_messages(metadata, video_url),
+        temperature=0.3,
+        max_tokens=2000,
+        response_format={"type": "json_object"},
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    async for chunk in stream:
+        if chunk.usage:
+            usage = chunk.usage.total_tokens
+        if chunk.choices and chunk.choices[0].delta.content:
+            for event in parser.feed(chunk.choices[0].delta.content):
+                yield event
+    yield "result", {"recipe": validate_recipe(parser.text.strip()), "usage": usage}
+
+
+# 같은 검색어/영상에 대한 동시 요청을 한 번의 외부 호출로 합침
+youtube_search_flight = SingleFlight("youtube_search")
+youtube_search_cache = YouTubeSearchCache(
+    fetch=lambda query: youtube_search_flight.do(query, lambda: search_youtube_video(query))
+)
+recipe_flight = LockedSingleFlight("recipe", db_lock(async_engine))
+
+
 class RecipeRequest(BaseModel):
     ingredients: List[str]
 
@@ -1133,7 +1496,7 @@ class RecipeRequest(BaseModel):
 async def generate_recipe(
     req: RecipeRequest,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """선택된 재료(1~3개)로 유튜브 요리 영상을 추천합니다."""
     ingredient_names = req.ingredients
@@ -1141,12 +1504,11 @@ async def generate_recipe(
         raise create_error_response(
             "재료는 1~3개만 선택 가능합니다.", status.HTTP_400_BAD_REQUEST
         )
-    query = " ".join(ingredient_names) + " 요리"
     try:
-        logger.info(f"YouTube 검색 시도: {query}")
-        videos = await search_youtube_video(query)
+        # 재료 순서와 상관없이 같은 조합이면 캐시된 검색 결과 사용
+        videos = await youtube_search_cache.get(ingredient_names)
     except Exception as e:
-        logger.error(f"YouTube 검색 실패 - 쿼리: {query}, 오류: {str(e)}")
+        logger.error(f"YouTube 검색 실패 - 재료: {ingredient_names}, 오류: {str(e)}")
         videos = []
     # 중복 제거 및 최대 5개로 제한
     unique_videos = []
@@ -1164,6 +1526,8 @@ async def generate_recipe(
         raise create_error_response(
             "적절한 요리 영상을 찾을 수 없습니다.", status.HTTP_404_NOT_FOUND
         )
+    # 사용자가 고를 영상들의 메타데이터를 한 번의 videos 호출로 미리 가져옴
+    video_metadata.prefetch([video["video_id"] for video in unique_videos])
     logger.info(
         f"레시피 생성 완료 - 사용자: {current_user.kakao_id}, 영상 수: {len(unique_videos)}"
     )
@@ -1174,57 +1538,341 @@ async def generate_recipe(
     }
 
 
-@app.post("/generate-recipe-details")
-@handle_db_operation("레시피 상세 생성")
-async def generate_recipe_details(
-    video_url: str,
-    current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    """선택된 YouTube 영상에 대한 레시피 상세 정보를 생성합니다."""
-    try:
-        # GPT로 레시피 상세 정보 생성
-        result = await generate_recipe_with_gpt(video_url)
+def recipe_response(recipe: dict) -> dict:
+    """캐시된 레시피에서 내부용 필드를 뺀 응답 형식"""
+    return {k: v for k, v in recipe.items() if k != "generation_tokens"}
 
-        if not result or "recipe" not in result:
-            raise create_error_response(
-                "레시피 상세 정보를 생성할 수 없습니다.",
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
 
-        recipe = result["recipe"]
+async def find_stored_recipe(video_id: str):
+    """다른 워커가 이미 저장한 레시피가 있는지 DB에서 확인합니다 (single-flight recheck)."""
+    async with AsyncSessionLocal() as db:
+        row = await db.scalar(select(Recipe).where(Recipe.video_id == video_id))
+    if row is None:
+        return None
+    recipe = recipe_payload(row)
+    recipe_cache.lru.set(video_id, recipe)
+    return recipe
+
 
-        # 레시피 저장
+async def save_generated_recipe(video_id: str, kakao_id: int, recipe: dict, usage) -> dict:
+    """생성한 레시피를 저장합니다. 여러 요청이 공유하므로 자체 세션을 사용합니다."""
+    async with AsyncSessionLocal() as db:
         new_recipe = Recipe(
             title=recipe["title"],
             subtitle=recipe["subtitle"],
             youtube_link=recipe["youtube_url"],
+            video_id=video_id,
             steps=recipe["steps"],
             ingredients=recipe["ingredients"],
             seasonings=recipe["seasonings"],
             created_at=datetime.datetime.now(),
-            kakao_id=current_user.kakao_id,
+            kakao_id=kakao_id,
+            generation_tokens=usage,
         )
         db.add(new_recipe)
-        db.commit()
-        db.refresh(new_recipe)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # 락 없이 실행된 다른 요청이 같은 영상을 먼저 저장함 → 그 레시피를 사용
+            await db.rollback()
+            return await find_stored_recipe(video_id)
+        await db.refresh(new_recipe)
+
+    saved = recipe_payload(new_recipe)
+    recipe_cache.store(video_id, saved)
+    recipe_index.add(saved["id"], saved["ingredients"])
+    recipe_matcher.append(saved["id"], saved["ingredients"], saved["seasonings"])
+    return saved
+
+
+async def create_recipe_for_video(video_id: str, kakao_id: int) -> dict:
+    """GPT로 레시피를 생성해 저장합니다."""
+    result = await generate_recipe_with_gpt(canonical_video_url(video_id))
+    if not result or "recipe" not in result:
+        raise ValueError("레시피 상세 정보를 생성할 수 없습니다.")
+    return await save_generated_recipe(video_id, kakao_id, result["recipe"], result.get("usage"))
+
+
+@app.post("/generate-recipe-details")
+@handle_db_operation("레시피 상세 생성")
+async def generate_recipe_details(
+    video_url: str,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """선택된 YouTube 영상에 대한 레시피 상세 정보를 생성합니다.
+
+    같은 영상으로 이미 생성된 레시피가 있으면 OpenAI를 호출하지 않고 그대로 돌려주며,
+    같은 영상에 대한 동시 요청은 한 번의 생성으로 합쳐집니다.
+    """
+    try:
+        video_id = extract_video_id(video_url)
+    except ValueError as e:
+        raise create_error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+    try:
+        cached = await recipe_cache.lookup(db, video_id)
+        if cached is not None:
+            is_starred = await db.scalar(
+                select(Star.id).where(
+                    Star.recipe_id == cached["id"], Star.kakao_id == current_user.kakao_id
+                )
+            )
+            return {
+                "status": "success",
+                "message": "저장된 레시피를 불러왔습니다.",
+                "recipe": {**recipe_response(cached), "is_starred": is_starred is not None},
+            }
+
+        # 생성(GPT 호출) 동안 요청 세션이 커넥션을 붙잡고 있지 않도록 트랜잭션을 끝냄
+        await db.rollback()
+        recipe = await recipe_flight.do(
+            video_id,
+            lambda: create_recipe_for_video(video_id, current_user.kakao_id),
+            recheck=lambda: find_stored_recipe(video_id),
+        )
 
         return {
             "status": "success",
             "message": "레시피 상세 정보가 생성되었습니다.",
-            "recipe": {**recipe, "id": new_recipe.id, "is_starred": False},
+            "recipe": {**recipe_response(recipe), "is_starred": False},
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
         raise create_error_response(
             f"레시피 상세 정보 생성 중 오류가 발생했습니다: {str(e)}",
             status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
 
+def recipe_events(recipe: dict):
+    """저장된 레시피를 스트리밍과 같은 순서의 이벤트로 바꿉니다."""
+    for field in RECIPE_STREAM_FIELDS:
+        yield field, recipe[field]
+    for index, step in enumerate(recipe["steps"]):
+        yield "step", {"index": index, "text": step}
+
+
+async def stream_and_save_recipe(video_id: str, kakao_id: int, queue: asyncio.Queue) -> dict:
+    """스트리밍으로 레시피를 생성하며 이벤트를 queue에 넣고, 검증을 통과한 최종 객체만 저장합니다."""
+    result = None
+    async for event, value in stream_recipe_with_gpt(canonical_video_url(video_id)):
+        if event == "result":
+            result = value
+        else:
+            queue.put_nowait((event, value))
+    return await save_generated_recipe(video_id, kakao_id, result["recipe"], result["usage"])
+
+
+async def stream_recipe_in_flight(video_id: str, kakao_id: int):
+    """recipe_flight 안에서 스트리밍 생성을 실행하며 (이벤트, 값)을 내보내고, 마지막에 ("recipe", 레시피)를 냅니다.
+
+    같은 영상의 생성이 이미 진행 중이거나(다른 요청/작업) 다른 워커가 먼저 저장했으면
+    그 결과를 기다렸다가 완성된 레시피의 이벤트를 한 번에 냅니다.
+    """
+    queue = asyncio.Queue()
+    flight = asyncio.ensure_future(
+        recipe_flight.do(
+            video_id,
+            lambda: stream_and_save_recipe(video_id, kakao_id, queue),
+            recheck=lambda: find_stored_recipe(video_id),
+        )
+    )
+    streamed = False
+    getter = None
+    try:
+        while True:
+            while not queue.empty():
+                streamed = True
+                yield queue.get_nowait()
+            if flight.done():
+                break
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.wait({getter, flight}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                streamed = True
+                yield getter.result()
+            else:
+                getter.cancel()
+            getter = None
+    finally:
+        # 클라이언트가 끊겨도 생성은 flight 태스크에서 계속되어 저장됨
+        if getter is not None:
+            getter.cancel()
+
+    recipe = flight.result()
+    if not streamed:
+        for event in recipe_events(recipe):
+            yield event
+    yield "recipe", recipe
+
+
+async def generate_recipe_events(video_id: str, kakao_id: int):
+    """레시피 상세 생성 SSE 본문. 저장된 레시피나 진행 중인 생성이 있으면 그 결과를 사용합니다."""
+    try:
+        is_starred = False
+        async with AsyncSessionLocal() as db:
+            recipe = await recipe_cache.lookup(db, video_id)
+            if recipe is not None:
+                is_starred = await db.scalar(
+                    select(Star.id).where(
+                        Star.recipe_id == recipe["id"], Star.kakao_id == kakao_id
+                    )
+                ) is not None
+        if recipe is None:
+            # 같은 영상에 대한 다른 요청/작업은 이 생성에 합류함
+            async for event, value in stream_recipe_in_flight(video_id, kakao_id):
+                if event == "recipe":
+                    recipe = value
+                else:
+                    yield format_sse({"event": event, "data": value})
+        else:
+            for event, value in recipe_events(recipe):
+                yield format_sse({"event": event, "data": value})
+
+        yield format_sse(
+            {"event": "done", "data": {**recipe_response(recipe), "is_starred": is_starred}}
+        )
+    except Exception as e:
+        logger.error(f"레시피 스트리밍 생성 중 오류 발생: {str(e)}")
+        yield format_sse(
+            {"event": "error", "data": {"detail": f"레시피 상세 정보 생성 중 오류가 발생했습니다: {str(e)}"}}
+        )
+
+
+@app.post("/generate-recipe-details/stream")
+async def generate_recipe_details_stream(
+    video_url: str,
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """레시피 상세 생성을 SSE로 스트리밍합니다.
+
+    title, subtitle, ingredients, seasonings, step(단계마다) 이벤트를 완성되는 대로 보내고,
+    저장이 끝나면 id가 포함된 done 이벤트를, 실패하면 error 이벤트를 보냅니다.
+    """
+    try:
+        video_id = extract_video_id(video_url)
+    except ValueError as e:
+        raise create_error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+    return StreamingResponse(
+        generate_recipe_events(video_id, current_user.kakao_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def run_recipe_job(job: dict) -> dict:
+    """작업 큐 워커에서 실행: 같은 영상의 생성은 다른 요청/작업과 합쳐짐"""
+    video_id = job["video_id"]
+    return await recipe_flight.do(
+        video_id,
+        lambda: create_recipe_for_video(video_id, job["kakao_id"]),
+        recheck=lambda: find_stored_recipe(video_id),
+    )
+
+
+recipe_jobs = JobQueue(run_recipe_job)
+
+
+async def find_job(job_id: str, kakao_id: int) -> dict:
+    job = await recipe_jobs.get(job_id)
+    if job is None or job["kakao_id"] != kakao_id:
+        raise create_error_response("작업을 찾을 수 없습니다.", status.HTTP_404_NOT_FOUND)
+    return job
+
+
+async def job_response(job: dict, db: AsyncSession) -> dict:
+    """작업 상태 응답. 성공한 작업이면 레시피도 함께 반환합니다."""
+    response = job_to_dict(job)
+    if job["status"] == SUCCEEDED:
+        recipe = await db.scalar(select(Recipe).where(Recipe.id == job["recipe_id"]))
+        response["recipe"] = recipe_response(recipe_payload(recipe)) if recipe else None
+    return response
+
+
+@app.post("/recipe-jobs", status_code=status.HTTP_202_ACCEPTED)
+@handle_db_operation("레시피 생성 작업 등록")
+async def create_recipe_job(
+    video_url: str,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """레시피 생성을 백그라운드 작업으로 등록하고 작업 id를 바로 반환합니다.
+
+    이미 생성된 영상이면 완료된 작업으로 바로 돌려줍니다.
+    """
+    try:
+        video_id = extract_video_id(video_url)
+    except ValueError as e:
+        raise create_error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+    cached = await recipe_cache.lookup(db, video_id)
+    # 작업 저장소는 자체 세션을 쓰므로, 등록하는 동안 요청 세션의 커넥션은 돌려줌
+    await db.rollback()
+    try:
+        job = await recipe_jobs.submit(
+            current_user.kakao_id, video_id, recipe_id=cached["id"] if cached else None
+        )
+    except JobRejected as e:
+        raise create_error_response(str(e), status.HTTP_429_TOO_MANY_REQUESTS)
+
+    return create_json_response(
+        await job_response(job, db), status_code=status.HTTP_202_ACCEPTED
+    )
+
+
+@app.get("/recipe-jobs/{job_id}")
+@handle_db_operation("레시피 생성 작업 조회")
+async def get_recipe_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """레시피 생성 작업의 상태를 조회합니다 (성공 시 recipe 포함)."""
+    job = await find_job(job_id, current_user.kakao_id)
+    return create_json_response(await job_response(job, db))
+
+
+async def recipe_job_events(request: Request, job: dict):
+    """작업 상태가 바뀔 때마다 status 이벤트를, 끝나면 done 또는 error 이벤트를 보냅니다."""
+    last_status = None
+    while True:
+        if job["status"] != last_status:
+            last_status = job["status"]
+            yield format_sse({"event": "status", "data": job_to_dict(job)})
+        if job["status"] == SUCCEEDED:
+            async with AsyncSessionLocal() as db:
+                response = await job_response(job, db)
+            yield format_sse({"event": "done", "data": response})
+            return
+        if job["status"] == FAILED:
+            yield format_sse({"event": "error", "data": {"detail": job["error"]}})
+            return
+
+        await recipe_jobs.wait(job["id"], timeout=1.0)
+        if await request.is_disconnected():
+            return
+        job = await recipe_jobs.get(job["id"])
+
+
+@app.get("/recipe-jobs/{job_id}/stream")
+async def stream_recipe_job(
+    job_id: str,
+    request: Request,
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """레시피 생성 작업의 진행 상태를 SSE로 전달합니다."""
+    job = await find_job(job_id, current_user.kakao_id)
+    return StreamingResponse(
+        recipe_job_events(request, job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/test/youtube")
 async def test_youtube():
     """YouTube API 테스트"""
@@ -1427,106 +2075,353 @@ async def test_full_flow():
         )
 
 
-async def check_expiring_ingredients(db: Session):
-    """유통기한이 3일 이하로 남은 재료를 확인하고 알림을 생성합니다."""
-    now = datetime.datetime.now()
-    three_days_later = now + datetime.timedelta(days=3)
-    
-    # 유통기한이 3일 이하로 남은 재료 조회
-    expiring_ingredients = db.query(Ingredient).filter(
-        Ingredient.limit_date <= three_days_later,
-        Ingredient.limit_date > now
-    ).all()
-    
-    notifications_created = []
-    
-    for ingredient in expiring_ingredients:
-        # 이미 알림이 있는지 확인
-        existing_notification = db.query(NotificationModel).filter(
-            NotificationModel.kakao_id == ingredient.kakao_id,
-            NotificationModel.title == "유통기한 임박 알림",
-            NotificationModel.body.like(f"%{ingredient.name}%"),
-            NotificationModel.created_at >= now - datetime.timedelta(days=1)
-        ).first()
-        
-        if not existing_notification:
-            days_left = (ingredient.limit_date - now).days
-            notification = NotificationModel(
-                kakao_id=ingredient.kakao_id,
-                title="유통기한 임박 알림",
-                body=f"{ingredient.name}의 유통기한이 {days_left}일 남았습니다.",
-                is_read=False
-            )
-            db.add(notification)
-            notifications_created.append(notification)
-    
-    if notifications_created:
-        db.commit()
-    
-    return notifications_created
+@app.get("/debug/pool")
+async def debug_pool():
+    """DB 커넥션 풀 사용 현황 (체크아웃, 오버플로, 대기 시간)"""
+    return create_json_response(pool_status())
+
+
+@app.post("/debug/images/reload")
+async def reload_image_catalog(db: AsyncSession = Depends(get_async_db)):
+    """images 테이블이 바뀐 뒤 메모리 이미지 카탈로그를 다시 적재합니다 (요청을 받은 워커만)."""
+    await image_catalog.reload(db)
+    return create_json_response({"images": len(image_catalog)})
+
+
+@app.get("/debug/scheduler")
+async def debug_scheduler():
+    """유통기한 체크 스케줄러의 리더 여부와 마지막/다음 실행 시각, 알림 타임라인과 알림 정리 상태"""
+    return create_json_response(
+        {
+            **expiry_scheduler.state(),
+            "timeline": expiry_timeline.state(),
+            "retention": {
+                **retention_scheduler.state(),
+                "last_report": notification_retention.last_report,
+            },
+        }
+    )
+
+
+@app.get("/debug/push")
+async def debug_push():
+    """웹 푸시 큐 길이와 전송/재시도/실패/정리 건수"""
+    return create_json_response(push_dispatcher.state())
+
+
+@app.get("/debug/events")
+async def debug_events():
+    """SSE 알림 브로커의 구독자 수와 발행 건수"""
+    return create_json_response(notification_broker.state())
+
+
+@app.get("/debug/recipe-cache")
+async def debug_recipe_cache():
+    """영상 id 레시피 캐시의 적중률과 절약한 OpenAI 토큰 수"""
+    return create_json_response(recipe_cache.stats())
+
+
+@app.get("/debug/singleflight")
+async def debug_singleflight():
+    """single-flight별 호출 수, 실제 실행 수, 합쳐진 호출 수"""
+    return create_json_response(flight_stats())
+
+
+@app.get("/debug/youtube-search-cache")
+async def debug_youtube_search_cache():
+    """재료 조합별 YouTube 검색 캐시의 적중률과 절약한 할당량"""
+    return create_json_response(youtube_search_cache.stats())
+
+
+@app.get("/debug/video-metadata")
+async def debug_video_metadata():
+    """영상 메타데이터 캐시 적중률과 prefetch 배치 호출 수"""
+    return create_json_response(video_metadata.stats())
+
+
+@app.get("/debug/recipe-jobs")
+async def debug_recipe_jobs():
+    """레시피 생성 작업 큐의 대기/실행 수와 처리 건수"""
+    return create_json_response(recipe_jobs.state())
+
+
+@app.get("/debug/recipe-index")
+async def debug_recipe_index():
+    """레시피 재료 역색인 크기와 평균 추천 계산 시간"""
+    return create_json_response(recipe_index.state())
+
+
+@app.get("/debug/recipe-matcher")
+async def debug_recipe_matcher():
+    """레시피 매칭 행렬 크기(레시피, 어휘, 0이 아닌 칸)와 평균 계산 시간"""
+    return create_json_response(recipe_matcher.state())
+
+
+@app.get("/debug/caches")
+async def debug_caches():
+    """인메모리 캐시별 크기와 hit/miss 통계"""
+    return create_json_response(cache_stats())
+
+
+@app.get("/debug/queries")
+async def debug_queries(limit: int = 50):
+    """쿼리 fingerprint별 실행 횟수와 p50/p99 시간"""
+    return create_json_response({"queries": query_logger.dump(limit)})
+
 
 @app.get("/check-expiring-ingredients")
 @handle_db_operation("유통기한 임박 재료 확인")
 async def check_expiring_ingredients_endpoint(
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """유통기한이 3일 이하로 남은 재료를 확인하고 알림을 생성합니다."""
     notifications = await check_expiring_ingredients(db)
     return create_json_response({
         "message": f"{len(notifications)}개의 알림이 생성되었습니다.",
-        "notifications": [n.to_dict() for n in notifications]
+        "notifications": [
+            {
+                "title": n["title"],
+                "body": n["body"],
+                "items": n["payload"]["items"],
+                "isRead": n["is_read"],
+                "createdAt": n["created_at"].isoformat()
+            }
+            for n in notifications
+        ]
     })
 
 
+@app.get("/push/vapid-public-key")
+async def get_vapid_public_key():
+    """브라우저 푸시 구독에 필요한 VAPID 공개키를 반환합니다."""
+    if not VAPID_PUBLIC_KEY:
+        raise create_error_response("푸시 알림이 설정되지 않았습니다.", status.HTTP_404_NOT_FOUND)
+    return create_json_response({"publicKey": VAPID_PUBLIC_KEY})
+
+
+@app.post("/push/subscription")
+@handle_db_operation("푸시 구독 저장")
+async def save_push_subscription(
+    subscription: PushSubscriptionCreate,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """브라우저의 푸시 구독 정보를 저장합니다."""
+    await db.execute(
+        update(User)
+        .where(User.kakao_id == current_user.kakao_id)
+        .values(push_subscription=json.dumps(subscription.model_dump()))
+    )
+    await db.commit()
+    return create_json_response({"message": "푸시 구독이 저장되었습니다."})
+
+
+@app.delete("/push/subscription")
+@handle_db_operation("푸시 구독 해제")
+async def delete_push_subscription(
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """저장된 푸시 구독 정보를 삭제합니다."""
+    await db.execute(
+        update(User)
+        .where(User.kakao_id == current_user.kakao_id)
+        .values(push_subscription=None)
+    )
+    await db.commit()
+    return create_json_response({"message": "푸시 구독이 해제되었습니다."})
+
+
+NOTIFICATION_PAGE_SIZE = 50
+NOTIFICATION_MAX_PAGE_SIZE = 100
+NOTIFICATION_MAX_BULK_IDS = 500
+
+
 @app.get("/notifications")
 @handle_db_operation("알림 조회")
 async def get_notifications(
+    limit: int = NOTIFICATION_PAGE_SIZE,
+    cursor: str | None = None,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """사용자의 알림 목록을 조회합니다."""
+    """사용자의 알림 목록을 최신순으로 조회합니다.
+
+    응답의 nextCursor를 cursor로 넘기면 그보다 오래된 알림을 이어서 조회합니다.
+    """
+    if not (1 <= limit <= NOTIFICATION_MAX_PAGE_SIZE):
+        raise create_error_response(
+            f"limit은 1~{NOTIFICATION_MAX_PAGE_SIZE} 사이여야 합니다.", status.HTTP_400_BAD_REQUEST
+        )
     try:
-        notifications = db.query(NotificationModel).filter(
+        query = select(NotificationModel).where(
             NotificationModel.kakao_id == current_user.kakao_id
-        ).order_by(NotificationModel.created_at.desc()).all()
-        
+        )
+        if cursor:
+            query = query.where(before_cursor(cursor))
+        notifications = (
+            await db.scalars(
+                query.order_by(
+                    NotificationModel.created_at.desc(), NotificationModel.id.desc()
+                ).limit(limit + 1)
+            )
+        ).all()
+
+        next_cursor = None
+        if len(notifications) > limit:
+            notifications = notifications[:limit]
+            next_cursor = encode_cursor(notifications[-1].created_at, notifications[-1].id)
+
         return create_json_response({
+            "nextCursor": next_cursor,
             "notifications": [
                 {
                     "id": n.id,
                     "title": n.title,
                     "body": n.body,
                     "isRead": n.is_read,
-                    "createdAt": n.created_at.isoformat()
+                    "createdAt": n.created_at.isoformat(),
+                    "items": (n.payload or {}).get("items", [])
                 }
                 for n in notifications
             ]
         })
+    except InvalidCursor as e:
+        raise create_error_response(str(e), status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         logger.error(f"알림 조회 중 오류 발생: {str(e)}")
         return create_error_response("알림 조회 중 오류가 발생했습니다.")
 
 
+@app.get("/notifications/unread-count")
+@handle_db_operation("읽지 않은 알림 수 조회")
+async def get_unread_notification_count(
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """읽지 않은 알림 수를 반환합니다 (COUNT 대신 users에 유지되는 카운터 사용)."""
+    unread = await db.scalar(
+        select(User.unread_notifications).where(User.kakao_id == current_user.kakao_id)
+    )
+    return create_json_response({"unreadCount": unread or 0})
+
+
+@app.get("/notifications/stream")
+async def notification_stream(
+    request: Request,
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """새 알림을 Server-Sent Events로 전달합니다 (연결 후 새로 생긴 알림만)."""
+    last_event_id = request.headers.get("last-event-id")
+    return StreamingResponse(
+        stream_notifications(
+            request,
+            current_user.kakao_id,
+            int(last_event_id) if last_event_id and last_event_id.isdigit() else None,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def notification_bulk_target(request: NotificationBulkRequest, kakao_id: int):
+    if request.ids is not None and len(request.ids) > NOTIFICATION_MAX_BULK_IDS:
+        raise create_error_response(
+            f"ids는 한 번에 최대 {NOTIFICATION_MAX_BULK_IDS}개까지 지정할 수 있습니다.",
+            status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        return bulk_target(kakao_id, request.ids, request.before, request.all)
+    except ValueError as e:
+        # InvalidCursor도 ValueError
+        raise create_error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@app.put("/notifications/read")
+@handle_db_operation("알림 일괄 읽음 처리")
+async def mark_notifications_as_read(
+    request: NotificationBulkRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """여러 알림을 UPDATE 한 번으로 읽음 처리합니다 (ids, before 커서 또는 all)."""
+    target = notification_bulk_target(request, current_user.kakao_id)
+    result = await db.execute(
+        update(NotificationModel)
+        .where(target, NotificationModel.is_read.is_(False))
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    await add_unread(db, {current_user.kakao_id: -result.rowcount})
+    await db.commit()
+
+    return create_json_response({
+        "message": f"{result.rowcount}개의 알림이 읽음 처리되었습니다.",
+        "updated": result.rowcount
+    })
+
+
+@app.delete("/notifications")
+@handle_db_operation("알림 일괄 삭제")
+async def delete_notifications(
+    request: NotificationBulkRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """여러 알림을 한 번에 삭제합니다 (ids, before 커서 또는 all).
+
+    읽지 않은 알림을 먼저 지워 rowcount로 카운터 감소분을 얻고, 나머지를 지웁니다.
+    """
+    target = notification_bulk_target(request, current_user.kakao_id)
+    unread = await db.execute(
+        delete(NotificationModel)
+        .where(target, NotificationModel.is_read.is_(False))
+        .execution_options(synchronize_session=False)
+    )
+    read = await db.execute(
+        delete(NotificationModel)
+        .where(target)
+        .execution_options(synchronize_session=False)
+    )
+    await add_unread(db, {current_user.kakao_id: -unread.rowcount})
+    await db.commit()
+
+    deleted = unread.rowcount + read.rowcount
+    return create_json_response({
+        "message": f"{deleted}개의 알림이 삭제되었습니다.",
+        "deleted": deleted,
+        "unreadDeleted": unread.rowcount
+    })
+
+
 @app.put("/notifications/{notification_id}/read")
 @handle_db_operation("알림 읽음 처리")
 async def mark_notification_as_read(
     notification_id: int,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """알림을 읽음 처리합니다."""
     try:
-        notification = db.query(NotificationModel).filter(
+        target = (
             NotificationModel.id == notification_id,
-            NotificationModel.kakao_id == current_user.kakao_id
-        ).first()
-        
+            NotificationModel.kakao_id == current_user.kakao_id,
+        )
+        # 같은 알림을 동시에 읽음 처리해도 카운터는 실제로 바뀐 행 수만큼만 줄임
+        result = await db.execute(
+            update(NotificationModel)
+            .where(*target, NotificationModel.is_read.is_(False))
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        notification = await db.scalar(select(NotificationModel).where(*target))
+
         if not notification:
             return create_error_response("알림을 찾을 수 없습니다.", status.HTTP_404_NOT_FOUND)
-        
-        notification.is_read = True
-        db.commit()
+
+        await add_unread(db, {current_user.kakao_id: -result.rowcount})
+        await db.commit()
         
         return create_json_response({
             "message": "알림이 읽음 처리되었습니다.",
@@ -1547,20 +2442,30 @@ async def mark_notification_as_read(
 async def delete_notification(
     notification_id: int,
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """알림을 삭제합니다."""
+    """알림을 삭제합니다. 읽지 않은 알림이면 지운 행 수만큼만 카운터를 줄입니다."""
     try:
-        notification = db.query(NotificationModel).filter(
+        target = (
             NotificationModel.id == notification_id,
-            NotificationModel.kakao_id == current_user.kakao_id
-        ).first()
-        
-        if not notification:
+            NotificationModel.kakao_id == current_user.kakao_id,
+        )
+        unread = await db.execute(
+            delete(NotificationModel)
+            .where(*target, NotificationModel.is_read.is_(False))
+            .execution_options(synchronize_session=False)
+        )
+        read = await db.execute(
+            delete(NotificationModel)
+            .where(*target)
+            .execution_options(synchronize_session=False)
+        )
+
+        if unread.rowcount + read.rowcount == 0:
             return create_error_response("알림을 찾을 수 없습니다.", status.HTTP_404_NOT_FOUND)
-        
-        db.delete(notification)
-        db.commit()
+
+        await add_unread(db, {current_user.kakao_id: -unread.rowcount})
+        await db.commit()
         
         return create_json_response({
             "message": "알림이 삭제되었습니다.",
@@ -0,0 +1,213 @@
+import os
+import time
+
+import numpy as np
+from sqlalchemy import select
+
+from models import Recipe
+from recipe_index import RECIPE_INDEX_REFRESH, ingredient_keys
+
+# 양념은 재료보다 덜 중요하게
+MATCH_SEASONING_WEIGHT = float(os.getenv("MATCH_SEASONING_WEIGHT", "0.5"))
+# 유통기한이 이 일수 안으로 남은 재료일수록 가중치를 더 줌
+MATCH_URGENCY_DAYS = float(os.getenv("MATCH_URGENCY_DAYS", "7"))
+# 오늘 만료되는 재료의 가중치 = 1 + MATCH_URGENCY_BOOST
+MATCH_URGENCY_BOOST = float(os.getenv("MATCH_URGENCY_BOOST", "1.0"))
+
+
+class RecipeMatcher:
+    """레시피 × 재료 어휘 희소 행렬로 냉장고와 모든 레시피의 점수를 한 번에 계산합니다.
+
+    행렬은 0이 아닌 칸마다 (행, 열, 가중치)를 담은 NumPy 배열(COO)로 두고,
+    사용자 벡터와의 곱은 np.bincount 한 번으로 구합니다. 새 레시피는 대기 목록에 쌓아 두었다가
+    다음 조회 때 배열 뒤에 이어 붙입니다.
+
+    점수 = Σ(가중치 × 사용자 재료 값) / 레시피 가중치 합. 사용자 재료 값은 1에서
+    유통기한이 가까울수록 최대 1 + urgency_boost까지 커집니다.
+    """
+
+    def __init__(
+        self,
+        vocabulary=(),
+        seasoning_weight: float = MATCH_SEASONING_WEIGHT,
+        urgency_days: float = MATCH_URGENCY_DAYS,
+        urgency_boost: float = MATCH_URGENCY_BOOST,
+        refresh_interval: float = RECIPE_INDEX_REFRESH,
+    ):
+        self.seasoning_weight = seasoning_weight
+        self.urgency_days = urgency_days
+        self.urgency_boost = urgency_boost
+        self.refresh_interval = refresh_interval
+        self.vocabulary = {}
+        for name in vocabulary:
+            for key in ingredient_keys(name):
+                self.vocabulary.setdefault(key, len(self.vocabulary))
+
+        self._rows = np.empty(0, dtype=np.int32)
+        self._cols = np.empty(0, dtype=np.int32)
+        self._weights = np.empty(0, dtype=np.float32)
+        self._totals = np.empty(0, dtype=np.float32)
+        self._recipe_ids = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        # 다음 조회 때 배열에 붙일 행들
+        self._pending = []
+        self._pending_nnz = 0
+        self._row_of = {}
+        self.n_rows = 0
+        # DB에서 마지막으로 읽은 id (append로 직접 넣은 레시피는 반영하지 않음)
+        self.scan_watermark = 0
+        self.last_refresh = 0.0
+        self.queries = 0
+        self.query_ms = 0.0
+
+    def _column(self, text: str):
+        """레시피 재료 하나의 열 번호. 어휘에 있는 키를 우선 쓰고, 없으면 전체 이름을 어휘에 추가합니다."""
+        keys = ingredient_keys(text)
+        if not keys:
+            return None
+        full = max(keys, key=len)
+        if full in self.vocabulary:
+            return self.vocabulary[full]
+        known = sorted(key for key in keys if key in self.vocabulary)
+        if known:
+            return self.vocabulary[known[0]]
+        self.vocabulary[full] = len(self.vocabulary)
+        return self.vocabulary[full]
+
+    def append(self, recipe_id: int, ingredients: list, seasonings: list = ()):
+        """레시피 한 행을 추가합니다. 같은 레시피가 이미 있으면 이전 행은 무효로 표시합니다."""
+        weights = {}
+        for items, weight in ((ingredients or [], 1.0), (seasonings or [], self.seasoning_weight)):
+            for item in items:
+                col = self._column(item)
+                if col is not None:
+                    weights[col] = max(weights.get(col, 0.0), weight)
+        if not weights:
+            return
+
+        old_row = self._row_of.get(recipe_id)
+        if old_row is not None and old_row < len(self._alive):
+            self._alive[old_row] = False
+        elif old_row is not None:
+            index = old_row - len(self._alive)
+            self._pending_nnz -= len(self._pending[index][1])
+            self._pending[index] = None
+
+        row = self.n_rows
+        self.n_rows += 1
+        self._row_of[recipe_id] = row
+        self._pending.append((recipe_id, weights))
+        self._pending_nnz += len(weights)
+
+    def _compact(self):
+        if not self._pending:
+            return
+        rows = np.empty(self._pending_nnz, dtype=np.int32)
+        cols = np.empty(self._pending_nnz, dtype=np.int32)
+        weights = np.empty(self._pending_nnz, dtype=np.float32)
+        totals = np.zeros(len(self._pending), dtype=np.float32)
+        recipe_ids = np.zeros(len(self._pending), dtype=np.int64)
+        alive = np.zeros(len(self._pending), dtype=bool)
+
+        base = len(self._alive)
+        pos = 0
+        for offset, entry in enumerate(self._pending):
+            if entry is None:
+                # 대기 중에 다시 추가된 레시피의 이전 행
+                continue
+            recipe_id, row_weights = entry
+            n = len(row_weights)
+            rows[pos:pos + n] = base + offset
+            cols[pos:pos + n] = list(row_weights.keys())
+            weights[pos:pos + n] = list(row_weights.values())
+            totals[offset] = sum(row_weights.values())
+            recipe_ids[offset] = recipe_id
+            alive[offset] = True
+            pos += n
+
+        self._rows = np.concatenate([self._rows, rows[:pos]])
+        self._cols = np.concatenate([self._cols, cols[:pos]])
+        self._weights = np.concatenate([self._weights, weights[:pos]])
+        self._totals = np.concatenate([self._totals, totals])
+        self._recipe_ids = np.concatenate([self._recipe_ids, recipe_ids])
+        self._alive = np.concatenate([self._alive, alive])
+        self._pending = []
+        self._pending_nnz = 0
+
+    def user_vector(self, items) -> np.ndarray:
+        """[(재료 이름, 유통기한까지 남은 일수 또는 None)]를 어휘 크기의 벡터로 바꿉니다."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for name, days_left in items:
+            value = 1.0
+            if days_left is not None and self.urgency_days > 0:
+                urgency = min(max((self.urgency_days - days_left) / self.urgency_days, 0.0), 1.0)
+                value += self.urgency_boost * urgency
+            for key in ingredient_keys(name):
+                col = self.vocabulary.get(key)
+                if col is not None:
+                    vector[col] = max(vector[col], value)
+        return vector
+
+    def top_k(self, items, k: int = 10) -> list:
+        """냉장고 재료로 점수가 높은 레시피 k개를 [(recipe_id, 점수, 충족률)]로 반환합니다."""
+        start = time.perf_counter()
+        self._compact()
+        n = len(self._alive)
+        if n == 0 or k <= 0:
+            return []
+
+        vector = self.user_vector(items)
+        hit = vector[self._cols]
+        weighted = np.bincount(self._rows, weights=self._weights * hit, minlength=n)
+        covered = np.bincount(self._rows, weights=self._weights * (hit > 0), minlength=n)
+        totals = np.maximum(self._totals, 1e-9)
+        scores = weighted / totals
+        scores[~self._alive | (covered == 0)] = -1.0
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        results = [
+            (int(self._recipe_ids[i]), float(scores[i]), float(covered[i] / totals[i]))
+            for i in top
+            if scores[i] > 0
+        ]
+        self.queries += 1
+        self.query_ms += (time.perf_counter() - start) * 1000
+        return results
+
+    async def refresh(self, db, force: bool = False) -> int:
+        """마지막으로 읽은 id 이후 저장된 레시피만 읽어 행렬에 더합니다.
+
+        RecipeIndex.refresh와 같이 기준 id는 DB에서 읽은 행으로만 올리고, 이미 있는 레시피는 건너뜁니다.
+        """
+        now = time.monotonic()
+        if not force and now - self.last_refresh < self.refresh_interval:
+            return 0
+        self.last_refresh = now
+        rows = (
+            await db.execute(
+                select(Recipe.id, Recipe.ingredients, Recipe.seasonings)
+                .where(Recipe.id > self.scan_watermark)
+                .order_by(Recipe.id)
+            )
+        ).all()
+        added = 0
+        for recipe_id, ingredients, seasonings in rows:
+            if recipe_id not in self._row_of:
+                self.append(recipe_id, ingredients, seasonings)
+                added += 1
+        if rows:
+            self.scan_watermark = rows[-1][0]
+        return added
+
+    def state(self) -> dict:
+        return {
+            "recipes": int(self._alive.sum()) + sum(1 for entry in self._pending if entry is not None),
+            "vocabulary": len(self.vocabulary),
+            "nnz": len(self._cols) + self._pending_nnz,
+            "pending_rows": len(self._pending),
+            "scan_watermark": self.scan_watermark,
+            "queries": self.queries,
+            "avg_query_ms": round(self.query_ms / self.queries, 3) if self.queries else 0.0,
+        }
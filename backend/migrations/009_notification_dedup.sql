@@ -0,0 +1,6 @@
+-- [user-009] 유통기한 알림 중복 방지 키와 유통기한 범위 스캔 인덱스
+-- 앱은 create_all만 하므로 기존 DB에는 직접 실행해야 합니다.
+ALTER TABLE notifications ADD COLUMN ingredient_id INT NULL,
+                          ADD COLUMN notify_date DATE NULL;
+CREATE UNIQUE INDEX uix_notification_dedup ON notifications (kakao_id, ingredient_id, notify_date);
+CREATE INDEX ix_ingredients_limit_date ON ingredients (limit_date);
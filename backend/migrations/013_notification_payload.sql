@@ -0,0 +1,9 @@
+-- [user-013] 알림에 재료 목록(payload) 저장
+-- 앱은 create_all만 하므로 기존 DB에는 직접 실행해야 합니다.
+-- (expiry_notices 테이블은 새 테이블이라 create_all이 만듭니다)
+ALTER TABLE notifications ADD COLUMN payload JSON NULL;
+
+-- 재료별 중복 방지가 expiry_notices로 옮겨가 더 이상 쓰지 않는 키 (009에서 추가)
+ALTER TABLE notifications DROP INDEX uix_notification_dedup,
+                          DROP COLUMN ingredient_id,
+                          DROP COLUMN notify_date;
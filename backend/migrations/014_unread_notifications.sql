@@ -0,0 +1,5 @@
+-- [user-014] 읽지 않은 알림 수 카운터와 커서 페이지네이션 인덱스
+-- 앱은 create_all만 하므로 기존 DB에는 직접 실행해야 합니다.
+-- 카운터 값은 다음 서버 시작 때 seed 락 안에서 실제 값으로 다시 계산됩니다.
+ALTER TABLE users ADD COLUMN unread_notifications INT NOT NULL DEFAULT 0;
+CREATE INDEX ix_notifications_user_created ON notifications (kakao_id, created_at, id);
@@ -0,0 +1,5 @@
+-- [user-018] 영상 id로 저장된 레시피 찾기, 생성 토큰 기록
+-- 앱은 create_all만 하므로 기존 DB에는 직접 실행해야 합니다.
+-- video_id는 다음 서버 시작 때 youtube_link에서 채워집니다.
+ALTER TABLE recipes ADD video_id VARCHAR(32) NULL UNIQUE,
+                    ADD generation_tokens INT NULL;
@@ -1,9 +1,10 @@
 import datetime
 
-from sqlalchemy import Column, Integer, ForeignKey, func, VARCHAR, DateTime, BigInteger, JSON, UniqueConstraint, String, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, func, VARCHAR, DateTime, BigInteger, JSON, UniqueConstraint, String, Boolean, Date, Index
 from sqlalchemy.orm import relationship
 
 from database import Base
+from image_catalog import image_catalog
 
 class User(Base):
     __tablename__ = "users"
@@ -15,6 +16,8 @@ class User(Base):
 
     # fcm_token = Column(VARCHAR(255), nullable=True)
     push_subscription = Column(VARCHAR(2000), nullable=True)
+    # 읽지 않은 알림 수 (알림 추가/읽음/삭제 시 함께 갱신, 배지 조회용)
+    unread_notifications = Column(Integer, nullable=False, default=0, server_default="0")
 
     ingredients = relationship("Ingredient", back_populates="user")
     stars = relationship("Star", back_populates="user")
@@ -28,11 +31,15 @@ class Recipe(Base):
     title = Column(VARCHAR(255), nullable=False)
     subtitle = Column(VARCHAR(255))
     youtube_link = Column(VARCHAR(255), nullable=False)
+    # youtube_link에서 뽑은 영상 id, 같은 영상은 한 번만 생성
+    video_id = Column(VARCHAR(32), unique=True, index=True, nullable=True)
     steps = Column(JSON, nullable=False)  # 요리 단계
     ingredients = Column(JSON, nullable=False)  # 재료 목록
     seasonings = Column(JSON, nullable=False)  # 양념 목록
     created_at = Column(DateTime(timezone=True), default=func.now())
     kakao_id = Column(BigInteger, ForeignKey("users.kakao_id"), nullable=True)
+    # 생성에 쓴 OpenAI 토큰 수 (캐시 적중 시 절약량 집계용)
+    generation_tokens = Column(Integer, nullable=True)
 
     stars = relationship("Star", back_populates="recipe")
     user = relationship("User", back_populates="recipes")
@@ -88,7 +95,7 @@ class Ingredient(Base):
     name = Column(VARCHAR(255), index=True)
     category = Column(VARCHAR(50))  # 카테고리 (예: "채소", "육류", "조미료")
     added_date = Column(DateTime, default=datetime.datetime.now)
-    limit_date = Column(DateTime, nullable=False)
+    limit_date = Column(DateTime, nullable=False, index=True)
     #is_frozen = Column(Boolean, default=False)
     kakao_id = Column(BigInteger, ForeignKey("users.kakao_id"))
     image_name = Column(VARCHAR(255), ForeignKey("images.name"), nullable=True)
@@ -114,11 +121,11 @@ class Ingredient(Base):
             "is_frozen": self.is_frozen,
             "is_expired": self.is_expired,
             "days_until_expiry": self.days_until_expiry,
-            "image_url": self.image.image_url if self.image else None
+            "image_url": image_catalog.url_for(self.image_name)
         }
 
     @classmethod
-    def create(cls, db, name, category, added_date, kakao_id, image_name=None, is_frozen=False):
+    async def create(cls, db, name, category, added_date, kakao_id, image_name=None, is_frozen=False):
         ingredient = cls(
             name=name,
             category=category,
@@ -129,8 +136,8 @@ class Ingredient(Base):
             is_frozen=is_frozen
         )
         db.add(ingredient)
-        db.commit()
-        db.refresh(ingredient)
+        await db.commit()
+        await db.refresh(ingredient)
         return ingredient
 
 
@@ -143,15 +150,66 @@ class Notification(Base):
     body = Column(VARCHAR(1000), nullable=False)
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.datetime.now)
+    # 알림에 포함된 재료 목록 등 구조화된 내용 ({"items": [...]}, 항목마다 재료 id 포함)
+    # 재료별 하루 한 번 중복 방지는 expiry_notices에서 합니다
+    payload = Column(JSON, nullable=True)
 
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        # 사용자별 최신순 커서 페이지네이션용
+        Index('ix_notifications_user_created', 'kakao_id', 'created_at', 'id'),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
             "title": self.title,
             "body": self.body,
             "isRead": self.is_read,
-            "createdAt": self.created_at.isoformat()
+            "createdAt": self.created_at.isoformat(),
+            "items": (self.payload or {}).get("items", [])
         }
-        
\ No newline at end of file
+        
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    name = Column(VARCHAR(100), primary_key=True)
+    holder = Column(VARCHAR(255), nullable=True)  # 현재 리더 워커 id
+    lease_until = Column(DateTime, nullable=False)
+    last_run_at = Column(DateTime, nullable=True)
+
+
+class ExpiryNotice(Base):
+    """재료별로 하루 한 번만 유통기한 알림을 보내기 위한 중복 방지 기록"""
+    __tablename__ = "expiry_notices"
+
+    kakao_id = Column(BigInteger, primary_key=True)
+    ingredient_id = Column(Integer, primary_key=True)
+    notify_date = Column(Date, primary_key=True)
+    run_id = Column(VARCHAR(32), nullable=False, index=True)  # 이 기록을 넣은 확인 실행
+
+
+class YouTubeSearchCacheEntry(Base):
+    """재료 조합별 YouTube 검색 결과 (워커 간, 재시작 후에도 재사용)"""
+    __tablename__ = "youtube_search_cache"
+
+    cache_key = Column(VARCHAR(255), primary_key=True)  # 정렬·정규화한 재료 이름 목록
+    videos = Column(JSON, nullable=False)
+    fetched_at = Column(DateTime, nullable=False)
+
+
+class RecipeJob(Base):
+    """백그라운드 레시피 생성 작업 (DB 작업 저장소용)"""
+    __tablename__ = "recipe_jobs"
+
+    id = Column(VARCHAR(32), primary_key=True)
+    kakao_id = Column(BigInteger, nullable=False, index=True)
+    video_id = Column(VARCHAR(32), nullable=False)
+    status = Column(VARCHAR(16), nullable=False)  # queued, running, succeeded, failed
+    recipe_id = Column(Integer, nullable=True)
+    error = Column(VARCHAR(500), nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
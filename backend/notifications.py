@@ -0,0 +1,89 @@
+import base64
+import datetime
+from collections import Counter
+
+from sqlalchemy import and_, case, func, or_, select, update
+
+from models import Notification as NotificationModel, User
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime.datetime, notification_id: int) -> str:
+    """(created_at, id) 위치를 URL에 넣을 수 있는 커서 문자열로 만듭니다."""
+    raw = f"{created_at.isoformat()}|{notification_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, notification_id = raw.split("|")
+        return datetime.datetime.fromisoformat(created_at), int(notification_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"잘못된 커서입니다: {cursor}") from e
+
+
+def before_cursor(cursor: str):
+    """커서보다 오래된 알림을 고르는 조건 (created_at DESC, id DESC 순서 기준)"""
+    created_at, notification_id = decode_cursor(cursor)
+    return or_(
+        NotificationModel.created_at < created_at,
+        and_(
+            NotificationModel.created_at == created_at,
+            NotificationModel.id < notification_id,
+        ),
+    )
+
+
+def bulk_target(kakao_id: int, ids=None, before: str = None, everything: bool = False):
+    """일괄 읽음/삭제 대상 조건. ids, before 커서, 전체 중 정확히 하나를 지정해야 합니다."""
+    if sum((ids is not None, before is not None, everything)) != 1:
+        raise ValueError("ids, before, all 중 하나만 지정해야 합니다.")
+    condition = NotificationModel.kakao_id == kakao_id
+    if ids is not None:
+        return and_(condition, NotificationModel.id.in_(ids))
+    if before is not None:
+        return and_(condition, before_cursor(before))
+    return condition
+
+
+async def add_unread(db, counts: dict):
+    """사용자별 읽지 않은 알림 수를 더하거나 뺍니다. ({kakao_id: 증감})
+
+    증감값이 같은 사용자끼리 묶어 UPDATE 한 번씩 실행합니다 (digest 알림이면 보통 한 번).
+    """
+    by_delta = {}
+    for kakao_id, delta in counts.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(kakao_id)
+    for delta, kakao_ids in by_delta.items():
+        new_count = User.unread_notifications + delta
+        await db.execute(
+            update(User)
+            .where(User.kakao_id.in_(kakao_ids))
+            .values(unread_notifications=case((new_count < 0, 0), else_=new_count))
+        )
+
+
+async def add_unread_for_rows(db, rows: list):
+    """새로 넣은 알림 행들만큼 읽지 않은 알림 수를 늘립니다."""
+    await add_unread(db, Counter(row["kakao_id"] for row in rows if not row.get("is_read")))
+
+
+def recount_unread_statement(kakao_ids=None):
+    """읽지 않은 알림 수를 실제 행 수로 다시 맞추는 UPDATE 문 (배포 직후나 보정용)"""
+    unread = (
+        select(func.count(NotificationModel.id))
+        .where(
+            NotificationModel.kakao_id == User.kakao_id,
+            NotificationModel.is_read.is_(False),
+        )
+        .scalar_subquery()
+    )
+    stmt = update(User).values(unread_notifications=unread)
+    if kakao_ids is not None:
+        stmt = stmt.where(User.kakao_id.in_(kakao_ids))
+    return stmt
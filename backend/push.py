@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select, update
+
+from database import AsyncSessionLocal
+from models import User
+
+logger = logging.getLogger(__name__)
+
+VAPID_PRIVATE_KEY = os.getenv("VAPID_PRIVATE_KEY")
+VAPID_PUBLIC_KEY = os.getenv("VAPID_PUBLIC_KEY")
+VAPID_CLAIMS_SUB = os.getenv("VAPID_CLAIMS_SUB", "mailto:admin@areono.store")
+PUSH_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "10000"))
+PUSH_WORKERS = int(os.getenv("PUSH_WORKERS", "8"))
+PUSH_MAX_RETRIES = int(os.getenv("PUSH_MAX_RETRIES", "3"))
+PUSH_RETRY_BACKOFF = float(os.getenv("PUSH_RETRY_BACKOFF", "1.0"))
+PUSH_BATCH_WINDOW = float(os.getenv("PUSH_BATCH_WINDOW", "0.05"))
+PUSH_BATCH_SIZE = int(os.getenv("PUSH_BATCH_SIZE", "100"))
+
+
+class PushGoneError(Exception):
+    """구독이 만료되었거나 삭제된 경우 (404/410)"""
+
+
+class WebPushSender:
+    """pywebpush로 실제 푸시를 보냅니다. 블로킹 호출이므로 스레드 풀에서 실행됩니다."""
+
+    def __init__(self, private_key: str = VAPID_PRIVATE_KEY, claims_sub: str = VAPID_CLAIMS_SUB):
+        self.private_key = private_key
+        self.claims_sub = claims_sub
+        # 스레드별 requests 세션으로 푸시 서비스와의 커넥션을 재사용
+        self._local = threading.local()
+
+    def _session(self):
+        import requests
+
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def __call__(self, subscription_info: dict, data: str):
+        from pywebpush import WebPushException, webpush
+
+        try:
+            webpush(
+                subscription_info=subscription_info,
+                data=data,
+                vapid_private_key=self.private_key,
+                vapid_claims={"sub": self.claims_sub},
+                timeout=10,
+                requests_session=self._session(),
+            )
+        except WebPushException as e:
+            status_code = getattr(e.response, "status_code", None)
+            if status_code in (404, 410):
+                raise PushGoneError(str(e)) from e
+            raise
+
+
+class PushDispatcher:
+    """알림을 bounded 큐에 넣고 워커들이 엔드포인트별로 묶어 푸시를 보냅니다.
+
+    큐가 가득 차면 새 메시지는 버리고(dropped), 실패한 전송은 지수 백오프로 재시도하며,
+    만료된(404/410) 구독은 users.push_subscription에서 지웁니다.
+    """
+
+    def __init__(
+        self,
+        sender=None,
+        workers: int = PUSH_WORKERS,
+        queue_size: int = PUSH_QUEUE_SIZE,
+        max_retries: int = PUSH_MAX_RETRIES,
+        retry_backoff: float = PUSH_RETRY_BACKOFF,
+        batch_window: float = PUSH_BATCH_WINDOW,
+        batch_size: int = PUSH_BATCH_SIZE,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.sender = sender
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.queue = None
+        self._executor = None
+        self._tasks = []
+        self.stats = {"enqueued": 0, "dropped": 0, "sent": 0, "retried": 0, "failed": 0, "pruned": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sender is not None
+
+    def start(self):
+        if self._tasks or not self.enabled:
+            return
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="webpush")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def enqueue(self, kakao_id: int, subscription: str, message: dict) -> bool:
+        """메시지를 큐에 넣습니다. 큐가 가득 찼으면 False."""
+        if self.queue is None:
+            return False
+        try:
+            self.queue.put_nowait((kakao_id, subscription, message))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return False
+        self.stats["enqueued"] += 1
+        return True
+
+    async def enqueue_notifications(self, db, rows: list):
+        """새로 만든 알림 행들을 구독이 있는 사용자에게 보내도록 큐에 넣습니다."""
+        if self.queue is None or not rows:
+            return
+        kakao_ids = {row["kakao_id"] for row in rows}
+        subscriptions = dict(
+            (
+                await db.execute(
+                    select(User.kakao_id, User.push_subscription).where(
+                        User.kakao_id.in_(kakao_ids), User.push_subscription.is_not(None)
+                    )
+                )
+            ).all()
+        )
+        for row in rows:
+            subscription = subscriptions.get(row["kakao_id"])
+            if subscription:
+                self.enqueue(row["kakao_id"], subscription, {"title": row["title"], "body": row["body"]})
+
+    async def _next_batch(self) -> list:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    @staticmethod
+    def _group_by_endpoint(batch: list) -> dict:
+        grouped = {}
+        for kakao_id, subscription, message in batch:
+            grouped.setdefault(subscription, (kakao_id, []))[1].append(message)
+        return grouped
+
+    @staticmethod
+    def _merge(messages: list) -> dict:
+        """같은 엔드포인트로 가는 여러 메시지를 하나의 푸시로 합칩니다."""
+        if len(messages) == 1:
+            return messages[0]
+        return {
+            "title": messages[0]["title"],
+            "body": f"{messages[0]['body']} 외 {len(messages) - 1}건",
+            "count": len(messages),
+        }
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                for subscription, (kakao_id, messages) in self._group_by_endpoint(batch).items():
+                    await self._deliver(kakao_id, subscription, self._merge(messages))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"푸시 전송 처리 중 오류 발생: {str(e)}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _deliver(self, kakao_id: int, subscription: str, message: dict):
+        loop = asyncio.get_running_loop()
+        try:
+            subscription_info = json.loads(subscription)
+        except json.JSONDecodeError:
+            await self._prune(kakao_id, subscription)
+            return
+        data = json.dumps(message, ensure_ascii=False)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                await loop.run_in_executor(self._executor, self.sender, subscription_info, data)
+                self.stats["sent"] += 1
+                return
+            except PushGoneError:
+                await self._prune(kakao_id, subscription)
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.stats["failed"] += 1
+                    logger.warning(f"푸시 전송 실패 (사용자 {kakao_id}): {str(e)}")
+                    return
+                self.stats["retried"] += 1
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+    async def _prune(self, kakao_id: int, subscription: str):
+        """만료된 구독을 지웁니다. 그 사이 새 구독으로 바뀌었으면 건드리지 않습니다."""
+        async with self.session_factory() as db:
+            await db.execute(
+                update(User)
+                .where(User.kakao_id == kakao_id, User.push_subscription == subscription)
+                .values(push_subscription=None)
+            )
+            await db.commit()
+        self.stats["pruned"] += 1
+
+    def state(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "workers": len(self._tasks),
+            **self.stats,
+        }
+
+
+# VAPID 키가 없으면 푸시는 비활성화되고 알림은 DB에만 저장됩니다
+push_dispatcher = PushDispatcher(sender=WebPushSender() if VAPID_PRIVATE_KEY else None)
@@ -0,0 +1,133 @@
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+
+logger = logging.getLogger("query_log")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+QUERY_LOG_SAMPLE_RATE = float(os.getenv("QUERY_LOG_SAMPLE_RATE", "0.01"))
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|:\w+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """리터럴과 바인드 파라미터를 ?로 바꿔 같은 형태의 쿼리를 하나로 묶습니다."""
+    fp = _STRING_RE.sub("?", statement)
+    fp = _NUMBER_RE.sub("?", fp)
+    fp = _PARAM_RE.sub("?", fp)
+    fp = _IN_LIST_RE.sub("(...)", fp)
+    return _SPACE_RE.sub(" ", fp).strip()
+
+
+class _Aggregate:
+    __slots__ = ("count", "total_ms", "max_ms", "rows", "samples")
+
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=sample_size)
+
+    def add(self, duration_ms: float, rowcount: int):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if rowcount > 0:
+            self.rows += rowcount
+        self.samples.append(duration_ms)
+
+    def to_dict(self) -> dict:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "rows": self.rows,
+            "avg_ms": round(self.total_ms / self.count, 3),
+            "p50_ms": round(_percentile(ordered, 0.50), 3),
+            "p99_ms": round(_percentile(ordered, 0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+def _percentile(ordered: list, q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class QueryLogger:
+    """엔진 이벤트로 쿼리 시간을 측정해 느린 쿼리는 항상, 나머지는 샘플링해서 기록합니다."""
+
+    def __init__(
+        self,
+        slow_ms: float = SLOW_QUERY_MS,
+        sample_rate: float = QUERY_LOG_SAMPLE_RATE,
+        max_fingerprints: int = 500,
+        sample_size: int = 1000,
+    ):
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+        self.max_fingerprints = max_fingerprints
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def attach(self, engine):
+        """동기 엔진(비동기 엔진은 engine.sync_engine)에 이벤트를 등록합니다."""
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        rowcount = getattr(cursor, "rowcount", -1)
+        fp = fingerprint(statement)
+        self.record(fp, duration_ms, rowcount)
+
+        if duration_ms >= self.slow_ms:
+            logger.warning(f"slow query {duration_ms:.1f}ms rows={rowcount}: {fp}")
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            logger.info(f"query {duration_ms:.1f}ms rows={rowcount}: {fp}")
+
+    def _error(self, context):
+        # 실패한 쿼리는 after_cursor_execute가 불리지 않으므로 시작 시각을 여기서 꺼냄
+        if context.connection is None or context.execution_context is None:
+            return
+        starts = context.connection.info.get("query_start_time")
+        if starts:
+            starts.pop()
+
+    def record(self, fp: str, duration_ms: float, rowcount: int):
+        with self._lock:
+            agg = self._stats.get(fp)
+            if agg is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    return
+                agg = self._stats[fp] = _Aggregate(self.sample_size)
+            agg.add(duration_ms, rowcount)
+
+    def dump(self, limit: int = 50) -> list:
+        """누적 시간이 큰 순서로 fingerprint별 통계를 반환합니다."""
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda kv: kv[1].total_ms, reverse=True)
+            return [{"fingerprint": fp, **agg.to_dict()} for fp, agg in items[:limit]]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+query_logger = QueryLogger()
@@ -0,0 +1,137 @@
+import os
+import re
+import threading
+from urllib.parse import parse_qs, urlparse
+
+from sqlalchemy import select, update
+
+from cache import TTLLRUCache
+from models import Recipe
+
+# 유튜브 영상 id는 11자리 [A-Za-z0-9_-]
+_VIDEO_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com"}
+
+
+def extract_video_id(video_url: str) -> str:
+    """watch?v=, shorts/, youtu.be/ 형식의 URL에서 영상 id를 꺼냅니다."""
+    parsed = urlparse(video_url.strip())
+    host = (parsed.hostname or "").lower()
+    video_id = None
+    if host in _YOUTUBE_HOSTS:
+        if parsed.path == "/watch":
+            video_id = parse_qs(parsed.query).get("v", [None])[0]
+        elif parsed.path.startswith(("/shorts/", "/embed/")):
+            video_id = parsed.path.split("/")[2]
+    elif host in ("youtu.be", "www.youtu.be"):
+        video_id = parsed.path.lstrip("/").split("/")[0]
+
+    if not video_id or not _VIDEO_ID.match(video_id):
+        raise ValueError(f"지원하지 않는 YouTube URL 형식입니다: {video_url}")
+    return video_id
+
+
+def canonical_video_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def recipe_payload(recipe: Recipe) -> dict:
+    """저장된 레시피를 generate_recipe_with_gpt가 돌려주는 recipe 형식으로 바꿉니다."""
+    return {
+        "id": recipe.id,
+        "title": recipe.title,
+        "subtitle": recipe.subtitle,
+        "steps": recipe.steps,
+        "ingredients": recipe.ingredients,
+        "seasonings": recipe.seasonings,
+        "youtube_url": recipe.youtube_link,
+        "generation_tokens": recipe.generation_tokens,
+    }
+
+
+class RecipeCache:
+    """영상 id로 이미 생성된 레시피를 찾습니다. 메모리 LRU → recipes.video_id 순서로 조회합니다.
+
+    어느 쪽이든 찾으면 OpenAI를 호출하지 않으므로, 생성 때 기록한 토큰 수만큼 절약한 것으로 셉니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.lru = TTLLRUCache("recipes", maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.lru_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self.tokens_spent = 0
+
+    def _hit(self, recipe: dict, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self.tokens_saved += recipe.get("generation_tokens") or 0
+
+    async def lookup(self, db, video_id: str):
+        recipe = self.lru.get(video_id)
+        if recipe is not None:
+            self._hit(recipe, "lru_hits")
+            return recipe
+
+        row = await db.scalar(select(Recipe).where(Recipe.video_id == video_id))
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        recipe = recipe_payload(row)
+        self.lru.set(video_id, recipe)
+        self._hit(recipe, "db_hits")
+        return recipe
+
+    def store(self, video_id: str, recipe: dict):
+        """새로 생성한 레시피를 캐시에 넣고 사용한 토큰 수를 기록합니다."""
+        self.lru.set(video_id, recipe)
+        with self._lock:
+            self.tokens_spent += recipe.get("generation_tokens") or 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.lru_hits + self.db_hits + self.misses
+            hits = self.lru_hits + self.db_hits
+            return {
+                "lookups": lookups,
+                "lru_hits": self.lru_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "tokens_saved": self.tokens_saved,
+                "tokens_spent": self.tokens_spent,
+            }
+
+
+def backfill_video_ids(db) -> int:
+    """video_id가 비어 있는 기존 레시피에 영상 id를 채웁니다 (sync 세션).
+
+    같은 영상의 레시피가 이미 여러 개면 가장 먼저 만든 것만 채워 unique 제약을 지킵니다.
+    """
+    taken = set(db.scalars(select(Recipe.video_id).where(Recipe.video_id.is_not(None))))
+    rows = db.execute(
+        select(Recipe.id, Recipe.youtube_link).where(Recipe.video_id.is_(None)).order_by(Recipe.id)
+    ).all()
+    updates = []
+    for recipe_id, youtube_link in rows:
+        try:
+            video_id = extract_video_id(youtube_link)
+        except ValueError:
+            continue
+        if video_id in taken:
+            continue
+        taken.add(video_id)
+        updates.append({"id": recipe_id, "video_id": video_id})
+    if updates:
+        db.execute(update(Recipe), updates)
+        db.commit()
+    return len(updates)
+
+
+recipe_cache = RecipeCache(
+    maxsize=int(os.getenv("RECIPE_CACHE_SIZE", "2000")),
+    ttl=float(os.getenv("RECIPE_CACHE_TTL", str(24 * 60 * 60))),
+)
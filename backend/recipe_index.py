@@ -0,0 +1,167 @@
+import os
+import re
+import time
+import unicodedata
+
+from sqlalchemy import select
+
+from models import Recipe
+
+# 다른 워커가 저장한 레시피를 반영하려고 새 행을 다시 읽는 간격
+RECIPE_INDEX_REFRESH = float(os.getenv("RECIPE_INDEX_REFRESH", "30"))
+
+# 괄호 안 설명
+_PAREN = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_DIGIT = re.compile(r"\d")
+# 재료 이름 뒤에 붙는 분량 표현
+_AMOUNT_WORDS = {"약간", "적당량", "조금", "한줌", "한꼬집", "취향껏", "적당히", "반개", "한개", "선택"}
+# 같은 재료의 다른 이름
+_SYNONYMS = {"달걀": "계란", "파": "대파", "쇠고기": "소고기"}
+# 재료 앞에 붙는 손질 표현 (단독 키로는 쓰지 않음)
+_MODIFIERS = {"다진", "썬", "채썬", "삶은", "데친", "구운", "볶은", "말린", "냉동", "생", "신선한", "손질한"}
+
+
+def normalize_ingredient(text: str) -> str:
+    """'대파(흰 부분) 1대', '감자 2개' 같은 재료 문자열에서 이름만 남깁니다."""
+    text = unicodedata.normalize("NFC", text)
+    text = _PAREN.sub(" ", text)
+    words = []
+    for word in text.replace(",", " ").split():
+        digit = _DIGIT.search(word)
+        if digit:
+            # 이름 뒤의 수량부터는 버리고('우유200ml' → 우유), 앞에 붙은 수량('1/2컵 우유')은 건너뜀
+            if digit.start() > 0:
+                words.append(word[:digit.start()])
+            if words:
+                break
+            continue
+        if word not in _AMOUNT_WORDS:
+            words.append(word)
+    return " ".join(words).lower()
+
+
+def ingredient_keys(text: str) -> frozenset:
+    """재료 하나를 찾을 때 쓸 키: 정규화한 전체 이름과 손질 표현을 뺀 각 단어 ('다진 마늘' → 마늘)"""
+    name = normalize_ingredient(text)
+    if not name:
+        return frozenset()
+    keys = {name}
+    words = name.split()
+    if len(words) > 1:
+        keys.update(w for w in words if w not in _MODIFIERS and len(w) >= 2)
+    return frozenset(_SYNONYMS.get(key, key) for key in keys)
+
+
+class RecipeIndex:
+    """재료 키 → 레시피 id 역색인. 냉장고 재료로 기존 레시피를 재료 충족률 순으로 찾습니다.
+
+    레시피의 재료마다 키 집합을 보관해 두고, 냉장고 키와 겹치는 재료 수 / 전체 재료 수를 점수로 씁니다.
+    """
+
+    def __init__(self, refresh_interval: float = RECIPE_INDEX_REFRESH):
+        self.refresh_interval = refresh_interval
+        self.postings = {}
+        # recipe_id -> 재료별 키 집합 목록
+        self.recipes = {}
+        # DB에서 마지막으로 읽은 id (add로 직접 넣은 레시피는 반영하지 않음)
+        self.scan_watermark = 0
+        self.last_refresh = 0.0
+        self.queries = 0
+        self.query_ms = 0.0
+
+    def add(self, recipe_id: int, ingredients: list):
+        """레시피 하나를 색인에 넣습니다 (이미 있으면 다시 넣음)."""
+        if recipe_id in self.recipes:
+            self.remove(recipe_id)
+        terms = [keys for keys in (ingredient_keys(i) for i in ingredients or []) if keys]
+        if not terms:
+            return
+        self.recipes[recipe_id] = terms
+        for keys in terms:
+            for key in keys:
+                self.postings.setdefault(key, set()).add(recipe_id)
+
+    def remove(self, recipe_id: int):
+        for keys in self.recipes.pop(recipe_id, []):
+            for key in keys:
+                ids = self.postings.get(key)
+                if ids is not None:
+                    ids.discard(recipe_id)
+                    if not ids:
+                        del self.postings[key]
+
+    async def refresh(self, db, force: bool = False) -> int:
+        """마지막으로 읽은 id 이후 저장된 레시피만 읽어 색인에 더합니다.
+
+        이 워커가 add로 먼저 넣은 레시피보다 작은 id로 다른 워커가 저장한 레시피도 놓치지 않도록
+        기준 id는 DB에서 읽은 행으로만 올리고, 이미 색인에 있는 레시피는 건너뜁니다.
+        """
+        now = time.monotonic()
+        if not force and now - self.last_refresh < self.refresh_interval:
+            return 0
+        self.last_refresh = now
+        rows = (
+            await db.execute(
+                select(Recipe.id, Recipe.ingredients)
+                .where(Recipe.id > self.scan_watermark)
+                .order_by(Recipe.id)
+            )
+        ).all()
+        added = 0
+        for recipe_id, ingredients in rows:
+            if recipe_id not in self.recipes:
+                self.add(recipe_id, ingredients)
+                added += 1
+        if rows:
+            self.scan_watermark = rows[-1][0]
+        return added
+
+    def rank(self, fridge: list, limit: int = 10) -> list:
+        """냉장고 재료 이름 목록으로 레시피를 점수순으로 고릅니다.
+
+        [(recipe_id, 충족률, 가진 재료 수, 전체 재료 수)]를 반환합니다.
+        """
+        start = time.perf_counter()
+        owned = set()
+        for name in fridge:
+            owned |= ingredient_keys(name)
+
+        candidates = set()
+        for key in owned:
+            candidates |= self.postings.get(key, set())
+
+        scored = []
+        for recipe_id in candidates:
+            terms = self.recipes[recipe_id]
+            matched = sum(1 for keys in terms if keys & owned)
+            scored.append((matched / len(terms), matched, recipe_id, len(terms)))
+        scored.sort(reverse=True)
+
+        self.queries += 1
+        self.query_ms += (time.perf_counter() - start) * 1000
+        return [
+            (recipe_id, coverage, matched, total)
+            for coverage, matched, recipe_id, total in scored[:limit]
+        ]
+
+    def matched_ingredients(self, recipe_ingredients: list, fridge: list):
+        """레시피 재료를 가진 것과 없는 것으로 나눕니다 (응답 표시용)."""
+        owned = set()
+        for name in fridge:
+            owned |= ingredient_keys(name)
+        have, missing = [], []
+        for ingredient in recipe_ingredients or []:
+            (have if ingredient_keys(ingredient) & owned else missing).append(ingredient)
+        return have, missing
+
+    def state(self) -> dict:
+        return {
+            "recipes": len(self.recipes),
+            "terms": len(self.postings),
+            "scan_watermark": self.scan_watermark,
+            "queries": self.queries,
+            "avg_query_ms": round(self.query_ms / self.queries, 3) if self.queries else 0.0,
+        }
+
+
+recipe_index = RecipeIndex()
@@ -0,0 +1,125 @@
+import json
+
+# 레시피 객체 안에서 완성되는 대로 내보낼 필드 (steps는 항목 하나씩)
+RECIPE_STREAM_FIELDS = ("title", "subtitle", "ingredients", "seasonings")
+
+
+class IncrementalRecipeParser:
+    """스트리밍으로 들어오는 {"recipe": {...}} JSON을 조금씩 읽어, 완성된 필드부터 이벤트로 돌려줍니다.
+
+    전체를 파싱하지 않고 (모든 깊이의) 문자열/괄호 깊이만 추적하다가, recipe 객체 바로 아래 값이 닫히면
+    그 부분만 json.loads 합니다. steps 배열은 항목이 닫힐 때마다 ("step", {...})를 냅니다.
+    최종 검증은 text 전체를 파싱해 따로 합니다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        # recipe 객체(깊이 2) 안에서 다음에 올 것이 key인지 value인지
+        self._expect = "key"
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+        self._item_start = None
+        self._step_index = 0
+
+    def _in_recipe(self) -> bool:
+        return self._stack == ["{", "{"]
+
+    def _in_steps(self) -> bool:
+        return self._stack == ["{", "{", "["] and self._key == "steps"
+
+    def _finish_value(self, end: int, events: list):
+        raw = self.text[self._value_start:end]
+        self._value_start = None
+        if self._key in RECIPE_STREAM_FIELDS:
+            try:
+                events.append((self._key, json.loads(raw)))
+            except json.JSONDecodeError:
+                pass
+
+    def _finish_item(self, end: int, events: list):
+        raw = self.text[self._item_start:end].strip()
+        self._item_start = None
+        try:
+            events.append(("step", {"index": self._step_index, "text": json.loads(raw)}))
+        except json.JSONDecodeError:
+            return
+        self._step_index += 1
+
+    def feed(self, chunk: str) -> list:
+        """텍스트 조각을 넣고, 이번에 완성된 (이벤트 이름, 값) 목록을 반환합니다."""
+        self.text += chunk
+        events = []
+        text = self.text
+        for pos in range(self._pos, len(text)):
+            ch = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._in_recipe():
+                        if self._key_start is not None:
+                            self._key = json.loads(text[self._key_start:pos + 1])
+                            self._key_start = None
+                        elif self._value_start is not None:
+                            self._finish_value(pos + 1, events)
+                    elif self._in_steps() and self._item_start is not None:
+                        self._finish_item(pos + 1, events)
+                continue
+
+            if ch.isspace():
+                continue
+
+            if self._in_recipe():
+                if self._expect == "key" and ch == '"':
+                    self._key_start = pos
+                    self._in_string = True
+                    self._expect = "colon"
+                    continue
+                if ch == ":":
+                    self._expect = "value"
+                    continue
+                if self._expect == "value":
+                    self._value_start = pos
+                    self._expect = "after_value"
+                    if ch == '"':
+                        self._in_string = True
+                        continue
+                if ch in ",}" and self._value_start is not None:
+                    # 숫자/true 같은 원시 값
+                    self._finish_value(pos, events)
+                if ch == ",":
+                    self._expect = "key"
+                    continue
+            elif self._in_steps() and self._item_start is None and ch not in ",]":
+                self._item_start = pos
+                if ch == '"':
+                    self._in_string = True
+                    continue
+
+            if ch == '"':
+                # 더 깊은 곳의 문자열 (재료 항목, step 객체 안 등): 괄호를 세지 않도록 상태만 추적
+                self._in_string = True
+            elif ch in "{[":
+                self._stack.append(ch)
+            elif ch in "}]":
+                if self._in_steps() and self._item_start is not None:
+                    self._finish_item(pos, events)
+                if self._stack:
+                    self._stack.pop()
+                # recipe 안의 객체/배열 값이 닫힘
+                if self._in_recipe() and self._value_start is not None:
+                    self._finish_value(pos + 1, events)
+            elif ch == "," and self._in_steps() and self._item_start is not None:
+                self._finish_item(pos, events)
+            elif ch == "," and self._in_recipe():
+                self._expect = "key"
+        self._pos = len(text)
+        return events
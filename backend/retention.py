@@ -0,0 +1,217 @@
+import asyncio
+import datetime
+import gzip
+import json
+import logging
+import os
+from collections import Counter
+
+from sqlalchemy import delete, select, tuple_
+
+from models import ExpiryNotice, Notification as NotificationModel, RecipeJob
+from notifications import add_unread
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_READ_RETENTION_DAYS = int(os.getenv("NOTIFICATION_READ_RETENTION_DAYS", "30"))
+NOTIFICATION_ARCHIVE_DAYS = int(os.getenv("NOTIFICATION_ARCHIVE_DAYS", "90"))
+NOTIFICATION_ARCHIVE_DIR = os.getenv("NOTIFICATION_ARCHIVE_DIR", "archive")
+EXPIRY_NOTICE_RETENTION_DAYS = int(os.getenv("EXPIRY_NOTICE_RETENTION_DAYS", "7"))
+RECIPE_JOB_RETENTION_DAYS = int(os.getenv("RECIPE_JOB_RETENTION_DAYS", "7"))
+RETENTION_CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", "1000"))
+# 청크 사이 쉬는 시간 (다른 쿼리가 끼어들 틈)
+RETENTION_CHUNK_PAUSE = float(os.getenv("RETENTION_CHUNK_PAUSE", "0.05"))
+
+
+class RetentionPolicy:
+    """알림 정리 규칙. condition(now)이 고른 행을 지우고, archive면 지우기 전에 파일로 남깁니다."""
+
+    def __init__(self, name: str, condition, archive: bool = False):
+        self.name = name
+        self.condition = condition
+        self.archive = archive
+
+
+def default_policies() -> list:
+    """90일 지난 알림은 모두 보관 후 삭제, 30일 지난 읽은 알림은 삭제 (0이면 해당 규칙 끔)"""
+    policies = []
+    if NOTIFICATION_ARCHIVE_DAYS > 0:
+        policies.append(
+            RetentionPolicy(
+                "archive_old",
+                lambda now: NotificationModel.created_at
+                < now - datetime.timedelta(days=NOTIFICATION_ARCHIVE_DAYS),
+                archive=True,
+            )
+        )
+    if NOTIFICATION_READ_RETENTION_DAYS > 0:
+        policies.append(
+            RetentionPolicy(
+                "delete_read",
+                lambda now: (NotificationModel.is_read.is_(True))
+                & (NotificationModel.created_at
+                   < now - datetime.timedelta(days=NOTIFICATION_READ_RETENTION_DAYS)),
+            )
+        )
+    return policies
+
+
+def _archive_line(notification) -> str:
+    return json.dumps(
+        {
+            "id": notification.id,
+            "kakao_id": notification.kakao_id,
+            "title": notification.title,
+            "body": notification.body,
+            "is_read": notification.is_read,
+            "created_at": notification.created_at.isoformat(),
+            "payload": notification.payload,
+        },
+        ensure_ascii=False,
+    )
+
+
+def _append_archive(path: str, lines: list):
+    # gzip은 멤버를 이어 붙여도 하나의 파일로 읽히므로 청크마다 append
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with gzip.open(path, "at", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+class NotificationRetention:
+    """notifications 테이블을 정책별로 작은 청크 단위로 정리합니다.
+
+    청크마다 id를 먼저 고르고 그 id만 지운 뒤 커밋하므로 긴 잠금을 잡지 않습니다.
+    읽지 않은 알림을 지우면 사용자별 unread 카운터도 함께 줄입니다.
+    """
+
+    def __init__(
+        self,
+        policies=None,
+        chunk_size: int = RETENTION_CHUNK_SIZE,
+        pause: float = RETENTION_CHUNK_PAUSE,
+        archive_dir: str = NOTIFICATION_ARCHIVE_DIR,
+    ):
+        self.policies = default_policies() if policies is None else policies
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.archive_dir = archive_dir
+        self.last_report = None
+
+    async def _apply(self, db, policy: RetentionPolicy, now: datetime.datetime, archive_path: str) -> dict:
+        deleted = archived = 0
+        condition = policy.condition(now)
+        while True:
+            if policy.archive:
+                rows = (
+                    await db.scalars(
+                        select(NotificationModel)
+                        .where(condition)
+                        .order_by(NotificationModel.id)
+                        .limit(self.chunk_size)
+                    )
+                ).all()
+                chunk = [(n.id, n.kakao_id, n.is_read) for n in rows]
+                if rows:
+                    await asyncio.to_thread(_append_archive, archive_path, [_archive_line(n) for n in rows])
+                    archived += len(rows)
+            else:
+                chunk = (
+                    await db.execute(
+                        select(NotificationModel.id, NotificationModel.kakao_id, NotificationModel.is_read)
+                        .where(condition)
+                        .order_by(NotificationModel.id)
+                        .limit(self.chunk_size)
+                    )
+                ).all()
+            if not chunk:
+                break
+
+            await db.execute(
+                delete(NotificationModel)
+                .where(NotificationModel.id.in_([row[0] for row in chunk]))
+                .execution_options(synchronize_session=False)
+            )
+            unread = Counter(kakao_id for _, kakao_id, is_read in chunk if not is_read)
+            await add_unread(db, {kakao_id: -count for kakao_id, count in unread.items()})
+            await db.commit()
+            db.expunge_all()
+            deleted += len(chunk)
+            if len(chunk) < self.chunk_size:
+                break
+            await asyncio.sleep(self.pause)
+        return {"deleted": deleted, "archived": archived}
+
+    async def purge_expiry_notices(self, db, today: datetime.date) -> int:
+        """중복 방지용 expiry_notices는 당일만 의미가 있으므로 오래된 행을 지웁니다."""
+        cutoff = today - datetime.timedelta(days=EXPIRY_NOTICE_RETENTION_DAYS)
+        key = (ExpiryNotice.kakao_id, ExpiryNotice.ingredient_id, ExpiryNotice.notify_date)
+        deleted = 0
+        while True:
+            keys = (
+                await db.execute(
+                    select(*key).where(ExpiryNotice.notify_date < cutoff).limit(self.chunk_size)
+                )
+            ).all()
+            if not keys:
+                break
+            await db.execute(
+                delete(ExpiryNotice)
+                .where(tuple_(*key).in_([tuple(k) for k in keys]))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            deleted += len(keys)
+            if len(keys) < self.chunk_size:
+                break
+            await asyncio.sleep(self.pause)
+        return deleted
+
+    async def purge_recipe_jobs(self, db, now: datetime.datetime) -> int:
+        """상태 조회 기간이 지난 레시피 생성 작업 기록을 지웁니다."""
+        cutoff = now - datetime.timedelta(days=RECIPE_JOB_RETENTION_DAYS)
+        deleted = 0
+        while True:
+            ids = (
+                await db.scalars(
+                    select(RecipeJob.id).where(RecipeJob.created_at < cutoff).limit(self.chunk_size)
+                )
+            ).all()
+            if not ids:
+                break
+            await db.execute(
+                delete(RecipeJob)
+                .where(RecipeJob.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            deleted += len(ids)
+            if len(ids) < self.chunk_size:
+                break
+            await asyncio.sleep(self.pause)
+        return deleted
+
+    async def run(self, db) -> dict:
+        """모든 정책을 순서대로 적용하고 정책별 삭제/보관 행 수를 반환합니다."""
+        started = datetime.datetime.now()
+        archive_path = os.path.join(
+            self.archive_dir, f"notifications-{started:%Y%m%d-%H%M%S}.ndjson.gz"
+        )
+        report = {"started_at": started.isoformat(), "policies": {}}
+        for policy in self.policies:
+            report["policies"][policy.name] = await self._apply(db, policy, started, archive_path)
+        report["expiry_notices_deleted"] = await self.purge_expiry_notices(db, started.date())
+        report["recipe_jobs_deleted"] = await self.purge_recipe_jobs(db, started)
+        report["reclaimed"] = (
+            sum(p["deleted"] for p in report["policies"].values())
+            + report["expiry_notices_deleted"]
+            + report["recipe_jobs_deleted"]
+        )
+        if any(p["archived"] for p in report["policies"].values()):
+            report["archive"] = archive_path
+        report["elapsed_ms"] = round((datetime.datetime.now() - started).total_seconds() * 1000, 1)
+        self.last_report = report
+        return report
+
+
+notification_retention = NotificationRetention()
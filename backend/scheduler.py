@@ -0,0 +1,192 @@
+import asyncio
+import datetime
+import logging
+import os
+import socket
+import uuid
+
+from sqlalchemy import select, update
+
+from database import AsyncSessionLocal, insert_ignore
+from models import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_LEASE_TTL = int(os.getenv("SCHEDULER_LEASE_TTL", "60"))
+SCHEDULER_TICK = int(os.getenv("SCHEDULER_TICK", "20"))
+
+# 프로세스마다 고유한 리더 후보 id
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseScheduler:
+    """scheduler_leases 테이블의 임대(lease) 행으로 여러 워커 중 하나만 주기 작업을 실행합니다.
+
+    리더는 tick마다(작업 실행 중에는 별도 태스크로) 임대를 연장하고,
+    마지막 실행 시각(last_run_at)도 DB에 남기므로 재시작해도 주기가 지나지 않았으면 바로 다시 실행하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        job,
+        lease_ttl: float = SCHEDULER_LEASE_TTL,
+        tick: float = SCHEDULER_TICK,
+        session_factory=AsyncSessionLocal,
+        on_elected=None,
+    ):
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self.lease_ttl = lease_ttl
+        self.tick = tick
+        self.session_factory = session_factory
+        # 리더가 된 직후 한 번 호출 (예: 리더만 들고 있는 상태 적재)
+        self.on_elected = on_elected
+        self.is_leader = False
+        self.last_run_at = None
+        self.last_error = None
+        self.runs = 0
+        self._task = None
+
+    async def try_acquire(self, db) -> bool:
+        """임대가 비었거나 만료됐거나 이미 내 것이면 임대를 가져오고 True를 반환합니다."""
+        now = datetime.datetime.now()
+        await db.execute(
+            insert_ignore(SchedulerLease, db.bind.dialect.name),
+            {"name": self.name, "holder": None, "lease_until": now},
+        )
+        result = await db.execute(
+            update(SchedulerLease)
+            .where(
+                SchedulerLease.name == self.name,
+                (SchedulerLease.holder == WORKER_ID)
+                | (SchedulerLease.holder.is_(None))
+                | (SchedulerLease.lease_until < now),
+            )
+            .values(
+                holder=WORKER_ID,
+                lease_until=now + datetime.timedelta(seconds=self.lease_ttl),
+            )
+        )
+        lease = await db.scalar(
+            select(SchedulerLease).where(SchedulerLease.name == self.name)
+        )
+        await db.commit()
+        self.last_run_at = lease.last_run_at
+        return result.rowcount == 1
+
+    async def renew(self) -> bool:
+        """작업 실행 중 별도 세션으로 내 임대를 연장합니다. 임대를 잃었으면 False."""
+        now = datetime.datetime.now()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name, SchedulerLease.holder == WORKER_ID)
+                .values(lease_until=now + datetime.timedelta(seconds=self.lease_ttl))
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+    async def _keep_lease(self):
+        # 작업이 임대 기간보다 오래 걸려도 다른 워커가 임대를 가져가 중복 실행하지 않도록
+        # TTL의 1/3마다 연장
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            try:
+                if not await self.renew():
+                    logger.warning(f"작업 중 스케줄러 임대를 잃었습니다 ({self.name})")
+                    return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"스케줄러 임대 연장 실패 ({self.name}): {str(e)}")
+
+    def is_due(self, now: datetime.datetime) -> bool:
+        if self.last_run_at is None:
+            return True
+        return now - self.last_run_at >= datetime.timedelta(seconds=self.interval)
+
+    async def run_once(self):
+        """임대를 확인하고, 리더이며 주기가 지났으면 작업을 실행합니다."""
+        async with self.session_factory() as db:
+            was_leader = self.is_leader
+            self.is_leader = await self.try_acquire(db)
+            if self.is_leader and not was_leader and self.on_elected is not None:
+                logger.info(f"스케줄러 리더 선출 ({self.name}): {WORKER_ID}")
+                await self.on_elected(db)
+            now = datetime.datetime.now()
+            if not self.is_leader or not self.is_due(now):
+                return
+
+            keeper = asyncio.create_task(self._keep_lease())
+            try:
+                await self.job(db)
+            finally:
+                keeper.cancel()
+                try:
+                    await keeper
+                except asyncio.CancelledError:
+                    pass
+            await db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name, SchedulerLease.holder == WORKER_ID)
+                .values(last_run_at=now)
+            )
+            await db.commit()
+            self.last_run_at = now
+            self.runs += 1
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"스케줄러 작업 중 오류 발생 ({self.name}): {str(e)}")
+            await asyncio.sleep(self.tick)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self):
+        """태스크를 멈추고, 리더였다면 다른 워커가 바로 이어받도록 임대를 반납합니다."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            async with self.session_factory() as db:
+                await db.execute(
+                    update(SchedulerLease)
+                    .where(SchedulerLease.name == self.name, SchedulerLease.holder == WORKER_ID)
+                    .values(holder=None)
+                )
+                await db.commit()
+            self.is_leader = False
+
+    def state(self) -> dict:
+        next_run_at = (
+            self.last_run_at + datetime.timedelta(seconds=self.interval)
+            if self.last_run_at
+            else None
+        )
+        return {
+            "name": self.name,
+            "worker_id": WORKER_ID,
+            "is_leader": self.is_leader,
+            "interval": self.interval,
+            "runs": self.runs,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "next_run_at": next_run_at.isoformat() if next_run_at else None,
+            "last_error": self.last_error,
+        }
@@ -97,6 +97,24 @@ class StarCreate(StarBase):
     pass
 
 
+class PushSubscriptionKeys(BaseModel):
+    p256dh: str
+    auth: str
+
+
+class PushSubscriptionCreate(BaseModel):
+    endpoint: str
+    expirationTime: Optional[int] = None
+    keys: PushSubscriptionKeys
+
+
+class NotificationBulkRequest(BaseModel):
+    """알림 일괄 처리 대상: ids 목록, before 커서보다 오래된 알림, 또는 all=true로 전체"""
+    ids: Optional[List[int]] = None
+    before: Optional[str] = None
+    all: bool = False
+
+
 class NotificationBase(BaseModel):
     title: str
     body: str
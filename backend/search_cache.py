@@ -0,0 +1,166 @@
+import asyncio
+import datetime
+import logging
+import os
+import threading
+import unicodedata
+
+from sqlalchemy import select
+
+from cache import TTLLRUCache
+from database import AsyncSessionLocal, upsert
+from models import YouTubeSearchCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# 이 시간 안의 결과는 그대로 사용
+YOUTUBE_SEARCH_FRESH_TTL = float(os.getenv("YOUTUBE_SEARCH_FRESH_TTL", str(6 * 60 * 60)))
+# 이 시간 안이면 오래된 결과를 먼저 돌려주고 뒤에서 새로 검색
+YOUTUBE_SEARCH_STALE_TTL = float(os.getenv("YOUTUBE_SEARCH_STALE_TTL", str(7 * 24 * 60 * 60)))
+YOUTUBE_SEARCH_CACHE_SIZE = int(os.getenv("YOUTUBE_SEARCH_CACHE_SIZE", "5000"))
+# DB에 검색 결과를 남길지 여부 (워커 간 공유, 재시작 후 재사용)
+YOUTUBE_SEARCH_CACHE_DB = os.getenv("YOUTUBE_SEARCH_CACHE_DB", "1") == "1"
+# search.list 한 번에 드는 YouTube 할당량
+YOUTUBE_SEARCH_QUOTA_COST = 100
+
+
+def normalize_ingredients(names) -> tuple:
+    """재료 이름 목록을 순서와 공백, 중복에 상관없이 같은 값이 되도록 정규화합니다."""
+    normalized = {
+        " ".join(unicodedata.normalize("NFC", name).split()).lower()
+        for name in names
+    }
+    normalized.discard("")
+    return tuple(sorted(normalized))
+
+
+def search_query(ingredients: tuple) -> str:
+    return " ".join(ingredients) + " 요리"
+
+
+class YouTubeSearchCache:
+    """재료 조합별 YouTube 검색 결과 캐시 (메모리 TTL+LRU → DB 순서로 조회).
+
+    fresh_ttl이 지난 결과도 stale_ttl 안이면 바로 돌려주고 백그라운드에서 다시 검색합니다
+    (stale-while-revalidate). 검색 실패 시에는 가지고 있던 결과를 계속 사용합니다.
+    """
+
+    def __init__(
+        self,
+        fetch,
+        fresh_ttl: float = YOUTUBE_SEARCH_FRESH_TTL,
+        stale_ttl: float = YOUTUBE_SEARCH_STALE_TTL,
+        maxsize: int = YOUTUBE_SEARCH_CACHE_SIZE,
+        persistent: bool = YOUTUBE_SEARCH_CACHE_DB,
+        session_factory=AsyncSessionLocal,
+    ):
+        # fetch(query) -> 영상 목록
+        self.fetch = fetch
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.persistent = persistent
+        self.session_factory = session_factory
+        # 값: (영상 목록, 검색 시각)
+        self.memory = TTLLRUCache("youtube_search", maxsize=maxsize, ttl=stale_ttl)
+        self._refreshing = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    async def _load(self, key: str):
+        async with self.session_factory() as db:
+            entry = await db.scalar(
+                select(YouTubeSearchCacheEntry).where(YouTubeSearchCacheEntry.cache_key == key)
+            )
+        if entry is None:
+            return None
+        return entry.videos, entry.fetched_at
+
+    async def _save(self, key: str, videos: list, fetched_at: datetime.datetime):
+        async with self.session_factory() as db:
+            await db.execute(
+                upsert(
+                    YouTubeSearchCacheEntry,
+                    db.bind.dialect.name,
+                    {"cache_key": key, "videos": videos, "fetched_at": fetched_at},
+                    ["videos", "fetched_at"],
+                )
+            )
+            await db.commit()
+
+    async def _search(self, key: str, ingredients: tuple) -> list:
+        videos = await self.fetch(search_query(ingredients))
+        fetched_at = datetime.datetime.now()
+        # 결과가 없으면 일시적인 문제일 수 있으므로 저장하지 않음
+        if videos:
+            self.memory.set(key, (videos, fetched_at))
+            if self.persistent:
+                try:
+                    await self._save(key, videos, fetched_at)
+                except Exception as e:
+                    logger.error(f"YouTube 검색 캐시 저장 중 오류 발생: {str(e)}")
+        return videos
+
+    async def _refresh(self, key: str, ingredients: tuple):
+        try:
+            await self._search(key, ingredients)
+            self._count("refreshes")
+        except Exception as e:
+            self._count("refresh_errors")
+            logger.warning(f"YouTube 검색 결과 갱신 실패 ({key}): {str(e)}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def _schedule_refresh(self, key: str, ingredients: tuple):
+        if key not in self._refreshing:
+            self._refreshing[key] = asyncio.create_task(self._refresh(key, ingredients))
+
+    async def get(self, names) -> list:
+        """재료 이름 목록에 대한 검색 결과를 반환합니다."""
+        ingredients = normalize_ingredients(names)
+        key = "|".join(ingredients)
+
+        entry = self.memory.get(key)
+        source = "hits"
+        if entry is None and self.persistent:
+            entry = await self._load(key)
+            source = "db_hits"
+        if entry is not None:
+            videos, fetched_at = entry
+            age = (datetime.datetime.now() - fetched_at).total_seconds()
+            if age < self.stale_ttl:
+                if source == "db_hits":
+                    self.memory.set(key, entry)
+                if age >= self.fresh_ttl:
+                    self._count("stale_hits")
+                    self._schedule_refresh(key, ingredients)
+                else:
+                    self._count(source)
+                return videos
+
+        self._count("misses")
+        return await self._search(key, ingredients)
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.hits + self.db_hits + self.stale_hits
+            lookups = hits + self.misses
+            return {
+                "lookups": lookups,
+                "hits": self.hits,
+                "db_hits": self.db_hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "quota_saved": hits * YOUTUBE_SEARCH_QUOTA_COST,
+            }
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import os
+
+from locks import async_named_lock
+
+logger = logging.getLogger(__name__)
+
+# 다른 워커가 같은 작업을 끝낼 때까지 기다리는 최대 시간 (GPT 응답 시간보다 길게)
+SINGLEFLIGHT_LOCK_TIMEOUT = float(os.getenv("SINGLEFLIGHT_LOCK_TIMEOUT", "120"))
+
+# 이름별로 등록된 single-flight (/debug/singleflight에서 통계 조회)
+flights = {}
+
+
+class SingleFlight:
+    """같은 key로 동시에 들어온 호출을 하나로 합칩니다.
+
+    처음 호출한 쪽이 작업을 태스크로 띄우고, 진행 중에 들어온 호출은 같은 결과(또는 예외)를 기다립니다.
+    작업은 별도 태스크라서 처음 요청이 끊겨도 기다리는 요청들은 결과를 받습니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        flights[name] = self
+
+    async def do(self, key, fn):
+        """key에 대한 작업 fn()을 실행하거나, 이미 진행 중이면 그 결과를 기다립니다."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(self._run(key, fn))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def is_inflight(self, key) -> bool:
+        return key in self._inflight
+
+    async def _run(self, key, fn):
+        try:
+            return await fn()
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self._inflight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
+
+
+class LockedSingleFlight(SingleFlight):
+    """워커 간에도 합치는 single-flight. 프로세스 안에서 합친 뒤 key별 분산 락을 잡고 실행합니다.
+
+    lock은 (이름, timeout)을 받아 잡았는지 여부를 넘겨주는 async context manager 팩토리입니다.
+    기본은 DB 락(MySQL GET_LOCK)이고, 같은 형태의 Redis 락으로 바꿔 끼울 수 있습니다.
+    락을 기다린 워커는 recheck()로 다른 워커가 남긴 결과(DB 행 등)를 먼저 확인합니다.
+    """
+
+    def __init__(self, name: str, lock, timeout: float = SINGLEFLIGHT_LOCK_TIMEOUT):
+        super().__init__(name)
+        self.lock = lock
+        self.timeout = timeout
+        self.remote_coalesced = 0
+        self.lock_timeouts = 0
+
+    async def do(self, key, fn, recheck=None):
+        return await super().do(key, lambda: self._locked(key, fn, recheck))
+
+    async def _locked(self, key, fn, recheck):
+        async with self.lock(f"{self.name}:{key}", self.timeout) as acquired:
+            if not acquired:
+                # 락을 못 잡아도 요청은 실패시키지 않고 직접 실행
+                self.lock_timeouts += 1
+                logger.warning(f"single-flight 락 대기 시간 초과 ({self.name}:{key})")
+            if recheck is not None:
+                result = await recheck()
+                if result is not None:
+                    self.remote_coalesced += 1
+                    return result
+            return await fn()
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "remote_coalesced": self.remote_coalesced,
+            "lock_timeouts": self.lock_timeouts,
+        }
+
+
+def db_lock(async_engine):
+    """LockedSingleFlight용 DB 락 팩토리"""
+    return lambda name, timeout: async_named_lock(async_engine, name, timeout)
+
+
+def flight_stats() -> dict:
+    """등록된 모든 single-flight의 통계를 반환합니다."""
+    return {name: f.stats() for name, f in flights.items()}
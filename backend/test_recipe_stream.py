@@ -0,0 +1,44 @@
+import json
+
+from recipe_stream import IncrementalRecipeParser
+
+
+def feed_all(text: str, size: int) -> list:
+    parser = IncrementalRecipeParser()
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return events
+
+
+def test_brackets_inside_strings():
+    recipe = {
+        "recipe": {
+            "title": "떡볶이 [매운맛]",
+            "subtitle": "중괄호 {도} 괜찮아요",
+            "ingredients": ["떡 300g", "고추장 [선택]", "어묵 \"사각\" 2장"],
+            "seasonings": ["설탕 {1큰술}", "간장]"],
+            "steps": ["떡을 [10분] 불린다.", "고추장을 넣고 {중불}에 끓인다."],
+        }
+    }
+    text = json.dumps(recipe, ensure_ascii=False)
+    for size in (1, 3, len(text)):
+        events = feed_all(text, size)
+        assert events == [
+            ("title", "떡볶이 [매운맛]"),
+            ("subtitle", "중괄호 {도} 괜찮아요"),
+            ("ingredients", ["떡 300g", "고추장 [선택]", "어묵 \"사각\" 2장"]),
+            ("seasonings", ["설탕 {1큰술}", "간장]"]),
+            ("step", {"index": 0, "text": "떡을 [10분] 불린다."}),
+            ("step", {"index": 1, "text": "고추장을 넣고 {중불}에 끓인다."}),
+        ]
+
+
+def test_object_steps_with_brackets():
+    text = '{"recipe": {"steps": [{"text": "면을 삶는다 ]"}, {"text": "[마무리]"}], "title": "국수"}}'
+    events = feed_all(text, 2)
+    assert events == [
+        ("step", {"index": 0, "text": {"text": "면을 삶는다 ]"}}),
+        ("step", {"index": 1, "text": {"text": "[마무리]"}}),
+        ("title", "국수"),
+    ]
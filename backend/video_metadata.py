@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+
+from cache import TTLLRUCache
+from http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+# videos.list는 요청 한 번에 id를 최대 50개까지 받음 (할당량은 id 수와 상관없이 1)
+YOUTUBE_VIDEOS_BATCH = 50
+VIDEO_METADATA_TTL = float(os.getenv("VIDEO_METADATA_TTL", str(6 * 60 * 60)))
+VIDEO_METADATA_CACHE_SIZE = int(os.getenv("VIDEO_METADATA_CACHE_SIZE", "5000"))
+
+
+async def fetch_video_snippets(video_ids: list) -> dict:
+    """videos?part=snippet을 50개씩 묶어 호출하고 {video_id: snippet 메타데이터}를 반환합니다."""
+    api_key = os.getenv("YOUTUBE_API_KEY")
+    if not api_key:
+        raise ValueError("YouTube API 키가 설정되지 않았습니다.")
+
+    ac = http_clients.get("youtube")
+    found = {}
+    for i in range(0, len(video_ids), YOUTUBE_VIDEOS_BATCH):
+        batch = video_ids[i:i + YOUTUBE_VIDEOS_BATCH]
+        response = await ac.get(
+            YOUTUBE_VIDEOS_URL,
+            params={"part": "snippet", "id": ",".join(batch), "key": api_key},
+        )
+        response.raise_for_status()
+
+        try:
+            data = response.json()
+        except json.JSONDecodeError as e:
+            raise ValueError(f"YouTube API 응답을 파싱할 수 없습니다: {str(e)}")
+
+        if "error" in data:
+            error_message = data["error"].get("message", "Unknown error")
+            raise ValueError(f"YouTube API 오류: {error_message}")
+
+        for item in data.get("items", []):
+            snippet = item.get("snippet") or {}
+            if not item.get("id") or not snippet:
+                continue
+            found[item["id"]] = {
+                "title": snippet.get("title", ""),
+                "description": snippet.get("description", ""),
+                "tags": snippet.get("tags", []),
+            }
+    return found
+
+
+class VideoMetadataCache:
+    """영상 id별 snippet 메타데이터 캐시.
+
+    검색 직후 결과 영상들을 한 번의 videos 호출로 미리 가져와 두고(prefetch),
+    레시피 생성 단계에서는 캐시나 진행 중인 prefetch 결과를 사용합니다.
+    """
+
+    def __init__(self, fetch=fetch_video_snippets, ttl: float = VIDEO_METADATA_TTL, maxsize: int = VIDEO_METADATA_CACHE_SIZE):
+        self.fetch = fetch
+        self.cache = TTLLRUCache("video_metadata", maxsize=maxsize, ttl=ttl)
+        # video_id -> 그 id를 가져오는 중인 prefetch 태스크
+        self._pending = {}
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self.batch_calls = 0
+        self.prefetched = 0
+        self.awaited_prefetch = 0
+        self.single_fetches = 0
+
+    async def _fetch_into_cache(self, video_ids: list) -> dict:
+        try:
+            found = await self.fetch(video_ids)
+            for video_id, metadata in found.items():
+                self.cache.set(video_id, metadata)
+            return found
+        finally:
+            for video_id in video_ids:
+                self._pending.pop(video_id, None)
+
+    def prefetch(self, video_ids: list):
+        """캐시에 없는 영상들의 메타데이터를 백그라운드에서 한 번에 가져옵니다."""
+        missing = [
+            video_id
+            for video_id in dict.fromkeys(video_ids)
+            if video_id not in self._pending and video_id not in self.cache
+        ]
+        if not missing:
+            return None
+        task = asyncio.create_task(self._fetch_into_cache(missing))
+        for video_id in missing:
+            self._pending[video_id] = task
+        # 태스크 참조를 들고 있어 도중에 GC되지 않게 함
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+        with self._lock:
+            self.batch_calls += 1
+            self.prefetched += len(missing)
+        return task
+
+    def _done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"영상 메타데이터 prefetch 실패: {str(task.exception())}")
+
+    async def get(self, video_id: str):
+        """영상 메타데이터를 반환합니다. 없으면 None."""
+        metadata = self.cache.get(video_id)
+        if metadata is not None:
+            return metadata
+
+        task = self._pending.get(video_id)
+        if task is not None:
+            with self._lock:
+                self.awaited_prefetch += 1
+            try:
+                found = await asyncio.shield(task)
+                if video_id in found:
+                    return found[video_id]
+            except Exception:
+                # prefetch가 실패하면 아래에서 단건으로 다시 시도
+                pass
+
+        with self._lock:
+            self.single_fetches += 1
+        found = await self._fetch_into_cache([video_id])
+        return found.get(video_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.cache.stats(),
+                "pending": len(self._pending),
+                "batch_calls": self.batch_calls,
+                "prefetched": self.prefetched,
+                "awaited_prefetch": self.awaited_prefetch,
+                "single_fetches": self.single_fetches,
+            }
+
+
+video_metadata = VideoMetadataCache()
@@ -198,3 +198,78 @@ export async function generateRecipeDetails(videoUrl) {
   }
 }
 
+/**
+ * 레시피 상세 생성 (SSE 스트리밍). onEvent(event, data)로 title, subtitle, ingredients,
+ * seasonings, step 이벤트를 받고, 완료되면 저장된 레시피(done 이벤트)를 반환합니다.
+ */
+export async function streamRecipeDetails(videoUrl, onEvent) {
+  const res = await fetch(`${BASE}/generate-recipe-details/stream?video_url=${encodeURIComponent(videoUrl)}`, {
+    method: "POST",
+    credentials: "include"
+  });
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => ({}));
+    throw new Error(errorData.detail || "레시피 상세 생성에 실패했습니다");
+  }
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const event = block.match(/^event: (.*)$/m)?.[1];
+      const data = block.match(/^data: (.*)$/m)?.[1];
+      if (!event || data === undefined) continue;
+      const parsed = JSON.parse(data);
+      if (event === "done") return parsed;
+      if (event === "error") throw new Error(parsed.detail || "레시피 상세 생성에 실패했습니다");
+      onEvent(event, parsed);
+    }
+  }
+  throw new Error("레시피 스트림이 중간에 끊어졌습니다");
+}
+
+
+/**
+ * 레시피 생성을 백그라운드 작업으로 요청하고 작업 정보를 반환합니다.
+ */
+export async function createRecipeJob(videoUrl) {
+  const res = await fetch(`${BASE}/recipe-jobs?video_url=${encodeURIComponent(videoUrl)}`, {
+    method: "POST",
+    credentials: "include"
+  });
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => ({}));
+    throw new Error(errorData.detail || "레시피 생성 요청에 실패했습니다");
+  }
+  return res.json();
+}
+
+/**
+ * 레시피 생성 작업 상태 조회 (status가 succeeded면 recipe 포함)
+ */
+export async function getRecipeJob(jobId) {
+  const res = await fetch(`${BASE}/recipe-jobs/${jobId}`, { credentials: "include" });
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => ({}));
+    throw new Error(errorData.detail || "레시피 생성 작업 조회에 실패했습니다");
+  }
+  return res.json();
+}
+
+/**
+ * 냉장고 재료로 만들 수 있는 저장된 레시피 추천 (재료 충족률 순)
+ */
+export async function getRecipeRecommendations(limit = 10) {
+  const res = await fetch(`${BASE}/recipes/recommendations?limit=${limit}`, { credentials: "include" });
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => ({}));
+    throw new Error(errorData.detail || "레시피 추천 조회에 실패했습니다");
+  }
+  return res.json();
+}
@@ -37,10 +37,11 @@ export async function checkExpiringIngredients() {
 }
 
 /**
- * 알림 목록 조회
+ * 알림 목록 조회 (cursor에 이전 응답의 nextCursor를 넘기면 다음 페이지)
  */
-export async function getNotifications() {
-  const res = await fetch(`${BASE}/notifications`, {
+export async function getNotifications(cursor) {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  const res = await fetch(`${BASE}/notifications${query}`, {
     credentials: "include",
   });
   if (!res.ok) {
@@ -79,3 +80,66 @@ export async function deleteNotification(notificationId) {
   }
   return res.json();
 }
+
+/**
+ * 알림 일괄 읽음 처리. target은 { ids: [...] }, { before: cursor }, { all: true } 중 하나
+ */
+export async function markNotificationsAsRead(target) {
+  const res = await fetch(`${BASE}/notifications/read`, {
+    method: "PUT",
+    credentials: "include",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(target),
+  });
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => ({}));
+    throw new Error(errorData?.detail || "알림 일괄 읽음 처리 중 오류 발생");
+  }
+  return res.json();
+}
+
+/**
+ * 알림 일괄 삭제. target 형식은 markNotificationsAsRead와 같음
+ */
+export async function deleteNotifications(target) {
+  const res = await fetch(`${BASE}/notifications`, {
+    method: "DELETE",
+    credentials: "include",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(target),
+  });
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => ({}));
+    throw new Error(errorData?.detail || "알림 일괄 삭제 중 오류 발생");
+  }
+  return res.json();
+}
+
+/**
+ * 읽지 않은 알림 수 조회 (배지용)
+ */
+export async function getUnreadNotificationCount() {
+  const res = await fetch(`${BASE}/notifications/unread-count`, {
+    credentials: "include",
+  });
+  if (!res.ok) {
+    const errorData = await res.json().catch(() => ({}));
+    throw new Error(errorData?.detail || "읽지 않은 알림 수 조회 중 오류 발생");
+  }
+  return res.json();
+}
+
+/**
+ * 새 알림 실시간 구독 (SSE). 반환된 함수를 호출하면 연결을 닫습니다.
+ * onResync는 서버가 일부 이벤트를 건너뛰었을 때 호출되므로 목록을 다시 불러오면 됩니다.
+ */
+export function subscribeNotifications(onNotification, onResync) {
+  const source = new EventSource(`${BASE}/notifications/stream`, {
+    withCredentials: true,
+  });
+  source.addEventListener("notification", (e) => onNotification(JSON.parse(e.data)));
+  if (onResync) {
+    source.addEventListener("resync", () => onResync());
+  }
+  return () => source.close();
+}